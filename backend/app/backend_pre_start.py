@@ -1,30 +1,34 @@
 import logging
-import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+from sqlalchemy import text
 from sqlalchemy.future import select
 from sqlalchemy.exc import OperationalError
-from tenacity import retry, stop_after_attempt, wait_fixed, before_log, after_log
-from app.core.database.db import async_get_db_session
-from .logging_config import InterceptHandler
+from tenacity import retry, stop_before_delay, wait_random_exponential, before_sleep_log
+from app.core.database.db import async_engine, async_get_db_session
+from app.core.startup import startup_timings
+from .logging_config import setup_logging
 from app.core.config import settings
 
-logging.basicConfig(handlers=[InterceptHandler()], level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
-max_tries = 10 * 1  # 1 minutes
-wait_seconds = 1
+# Session-level advisory lock held while a worker runs the bootstrap steps
+BOOTSTRAP_LOCK_KEY = 0x6D6174657570  # "mateup"
 
 
 @retry(
-    stop=stop_after_attempt(max_tries),
-    wait=wait_fixed(wait_seconds),
-    before=before_log(logger, logging.INFO),
-    after=after_log(logger, logging.WARN),
+    stop=stop_before_delay(settings.STARTUP_DB_WAIT_SECONDS),
+    # jittered so workers started together do not retry in lockstep
+    wait=wait_random_exponential(multiplier=0.1, max=settings.STARTUP_DB_RETRY_MAX_WAIT_SECONDS),
+    before_sleep=before_sleep_log(logger, logging.WARN),
+    reraise=True,
 )
 async def init() -> None:
     """
     Initialize the database connection by trying to execute a simple SELECT 1 statement.
-    This function uses tenacity to retry the connection attempt until the database is ready.
-    If the connection cannot be established after the maximum number of retries, it raises an OperationalError.
+    This function uses tenacity to retry the connection attempt, with jittered exponential
+    backoff, until the database is ready or STARTUP_DB_WAIT_SECONDS have passed.
     """
     try:
         async for session in async_get_db_session():
@@ -35,6 +39,32 @@ async def init() -> None:
         raise e
 
 
+@asynccontextmanager
+async def bootstrap_lock():
+    """
+    Hold a Postgres advisory lock so only one worker (of any host) bootstraps
+    at a time; the others wait, then find the work done. Waiting is bounded
+    by ``lock_timeout``, scoped to the acquiring transaction.
+    """
+    async with async_engine.connect() as connection:
+        with startup_timings.phase("bootstrap_lock_wait"):
+            await connection.execute(
+                text("SELECT set_config('lock_timeout', :timeout, true)"),
+                {"timeout": f"{int(settings.STARTUP_BOOTSTRAP_LOCK_TIMEOUT_SECONDS * 1000)}ms"},
+            )
+            await connection.execute(
+                text("SELECT pg_advisory_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY}
+            )
+            await connection.commit()
+        try:
+            yield
+        finally:
+            await connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": BOOTSTRAP_LOCK_KEY}
+            )
+            await connection.commit()
+
+
 async def create_admin_first_user() -> None:
     """
     Create a default admin user if it does not exist.
@@ -42,7 +72,7 @@ async def create_admin_first_user() -> None:
     async for session in async_get_db_session():
         from app.models.user import User
         from app.schemas.user import UserRoleEnum
-        from app.core.security import get_password_hash
+        from app.core.security import hash_password
 
         result = await session.execute(
             select(User).where(User.username == settings.ROOT_USERNAME)
@@ -52,7 +82,7 @@ async def create_admin_first_user() -> None:
             admin_first_user = User(
                 username=settings.ROOT_USERNAME,
                 email=settings.ROOT_EMAIL,
-                password=get_password_hash(settings.ROOT_PASSWORD),
+                password=await hash_password(settings.ROOT_PASSWORD),
                 role=UserRoleEnum.admin,
                 is_active=True,
             )
@@ -63,26 +93,34 @@ async def create_admin_first_user() -> None:
             logger.info("Admin user already exists.")
 
 
+def bootstrap_steps() -> list[tuple[str, Callable[[], Awaitable[None]]]]:
+    """
+    Steps run under the bootstrap lock, in order. Each one must be idempotent:
+    every worker runs them, all but the first finding nothing left to do.
+    """
+    steps = []
+    if settings.ADD_ROOT_USER:
+        steps.append(("create_admin_user", create_admin_first_user))
+    else:
+        logger.info("Admin user not created.")
+    return steps
+
+
 async def async_main() -> None:
     """
-    Main initialization function that logs the start and completion of the service initialization.
-    Calls the init function to ensure the database is ready before proceeding.
+    Main initialization function: waits for the database, then runs the bootstrap
+    steps under the advisory lock. Each phase is timed in ``startup_timings``.
     """
-    start_time = time.time()
     logger.info("Initializing service...")
     try:
-        await init()
-        if(settings.ADD_ROOT_USER):
-            logger.info("Creating admin user...")
-            await create_admin_first_user()
-        elif(settings.ADD_ROOT_USER == False):
-            logger.info("Admin user not created.")
-        elapsed_time = time.time() - start_time
-        logger.info("Service successfully initialized in %.2f seconds.", elapsed_time)
+        with startup_timings.phase("database_wait"):
+            await init()
+        steps = bootstrap_steps()
+        if steps:
+            async with bootstrap_lock():
+                for name, step in steps:
+                    with startup_timings.phase(name):
+                        await step()
     except Exception as e:
-        elapsed_time = time.time() - start_time
-        logger.error(
-            "Service initialization failed after %.2f seconds. Error: %s",
-            elapsed_time,
-            str(e),
-        )
+        startup_timings.fail(e)
+        logger.error("Service initialization failed. Error: %s", str(e))
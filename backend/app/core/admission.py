@@ -0,0 +1,155 @@
+import json
+import logging
+from enum import IntEnum
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database.db import async_engine
+from app.core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_REJECTED
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    low = 0
+    normal = 1
+    high = 2
+
+
+# (path prefix, priority) - first match wins, everything else is normal.
+# Auth and the caller's own profile stay available longest; admin tooling,
+# dashboards and exports are the first to be shed.
+ROUTE_PRIORITIES = (
+    ("/auth/", Priority.high),
+    ("/users/me", Priority.high),
+    ("/admin/", Priority.low),
+    ("/users/session/stats", Priority.low),
+)
+
+# Routes that never touch the database and are never shed
+EXEMPT_PATHS = ("/metrics", "/docs", "/redoc", "/openapi.json", "/health")
+
+# Share of the concurrency budget each priority may fill, and multiple of the
+# pool-wait budget it tolerates before being shed
+CONCURRENCY_SHARE = {Priority.low: 0.5, Priority.normal: 0.8, Priority.high: 1.0}
+WAIT_TOLERANCE = {Priority.low: 0.5, Priority.normal: 1.0, Priority.high: 4.0}
+
+
+def route_priority(path: str) -> Priority:
+    for prefix, priority in ROUTE_PRIORITIES:
+        if path.startswith(prefix):
+            return priority
+    return Priority.normal
+
+
+class AdmissionController:
+    """
+    Per-worker admission control in front of the database pool.
+
+    A request is rejected up front when admitting it would exceed its
+    priority's share of ``max_concurrent`` in-flight requests, or when callers
+    are already queuing on the pool and its recent checkout wait is above the
+    priority's multiple of ``max_pool_wait``. Shedding early with a 503 keeps
+    requests from piling up for ``pool_timeout`` seconds while Postgres is slow.
+    """
+
+    def __init__(self, engine, max_concurrent: int = 0, max_pool_wait_ms: float = 500.0):
+        self.engine = engine
+        self._max_concurrent = max_concurrent
+        self.max_pool_wait = max_pool_wait_ms / 1000
+        self.in_flight = 0
+        self.admitted = {priority.name: 0 for priority in Priority}
+        self.rejected = {priority.name: 0 for priority in Priority}
+
+    @property
+    def max_concurrent(self) -> int:
+        return self._max_concurrent or self.engine.pool.capacity
+
+    def _reject_reason(self, priority: Priority):
+        if self.in_flight >= self.max_concurrent * CONCURRENCY_SHARE[priority]:
+            return "concurrency"
+        pool = self.engine.pool
+        if pool.waiting and pool.recent_wait() > self.max_pool_wait * WAIT_TOLERANCE[priority]:
+            return "pool_wait"
+        return None
+
+    def try_admit(self, priority: Priority) -> bool:
+        reason = self._reject_reason(priority)
+        if reason is not None:
+            self.rejected[priority.name] += 1
+            ADMISSION_REJECTED.inc(priority=priority.name, reason=reason)
+            return False
+        self.in_flight += 1
+        self.admitted[priority.name] += 1
+        ADMISSION_IN_FLIGHT.inc()
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.dec()
+
+    def stats(self) -> dict:
+        pool = self.engine.pool
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent,
+            "max_pool_wait_ms": self.max_pool_wait * 1000,
+            "pool_waiting": pool.waiting,
+            "pool_recent_wait_ms": round(pool.recent_wait() * 1000, 3),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: AdmissionController, retry_after: int = 1):
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+        self._body = json.dumps(
+            {"detail": "Service is temporarily overloaded, retry shortly."}
+        ).encode("utf-8")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path == "/" or path.startswith(EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        if not self.controller.try_admit(route_priority(path)):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(self._body)).encode()),
+                        (b"retry-after", str(self.retry_after).encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": self._body})
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+
+admission_controller = AdmissionController(
+    async_engine,
+    max_concurrent=settings.ADMISSION_MAX_CONCURRENT,
+    max_pool_wait_ms=settings.ADMISSION_MAX_POOL_WAIT_MS,
+)
+
+
+def setup_admission_control(app):
+    if not settings.ADMISSION_ENABLED:
+        return
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
@@ -0,0 +1,163 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+from app.schemas.user import UserPrincipal
+
+
+class TTLCache:
+    """
+    Bounded in-process cache with LRU eviction and per-entry expiry.
+
+    Not thread-safe: it is meant to be used from the event loop of a single worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class UserPrincipalCache:
+    """Authenticated user principals keyed by username, evictable by username or id."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._usernames_by_id: dict[int, str] = {}
+
+    def get(self, username: str) -> Optional[UserPrincipal]:
+        return self._cache.get(username)
+
+    def put(self, principal: UserPrincipal) -> None:
+        self._cache.set(principal.username, principal)
+        if self._cache.enabled:
+            self._usernames_by_id[principal.id] = principal.username
+            if len(self._usernames_by_id) > 2 * self._cache.maxsize:
+                self._usernames_by_id = {
+                    user_id: username
+                    for user_id, username in self._usernames_by_id.items()
+                    if username in self._cache
+                }
+
+    def evict(self, username: Optional[str] = None, user_id: Optional[int] = None) -> None:
+        if user_id is not None:
+            cached_username = self._usernames_by_id.pop(user_id, None)
+            if cached_username is not None:
+                self._cache.pop(cached_username)
+        if username is not None:
+            self._cache.pop(username)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._usernames_by_id.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+class TokenPayloadCache:
+    """
+    Verified JWT claims keyed by a digest of the raw token.
+
+    Entries never outlive the token's own ``exp`` claim, so a hit is always a
+    token that would still pass signature and expiry verification.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(kind: str, token: str) -> tuple[str, bytes]:
+        return kind, hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, kind: str, token: str) -> Optional[dict]:
+        return self._cache.get(self._key(kind, token))
+
+    def put(self, kind: str, token: str, payload: dict) -> None:
+        exp = payload.get("exp")
+        if exp is None:
+            return
+        self._cache.set(self._key(kind, token), payload, ttl=exp - time.time())
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+user_cache = UserPrincipalCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+token_cache = TokenPayloadCache(
+    maxsize=settings.TOKEN_CACHE_MAXSIZE,
+    ttl=settings.TOKEN_CACHE_MAX_TTL_SECONDS,
+)
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+# Authenticated, per-user representations: shared caches must not store them
+# and clients must revalidate (cheaply, via If-None-Match) before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(user_id: int, update_at: Optional[datetime]) -> Optional[str]:
+    """Validator of a user resource; ``update_at`` changes on every write to the row"""
+    if update_at is None:
+        return None
+    return f'W/"{user_id}-{int(update_at.timestamp() * 1_000_000)}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def if_none_match(request: Request, etag: Optional[str]) -> bool:
+    """Whether the request's If-None-Match matches ``etag`` (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = _opaque(etag)
+    return any(_opaque(tag) == opaque for tag in header.split(","))
+
+
+def set_validators(response: Response, etag: Optional[str]) -> None:
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    response.headers["Vary"] = "Authorization"
+    if etag is not None:
+        response.headers["ETag"] = etag
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag)
+    return response
@@ -25,6 +25,135 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     ALEMBIC_DB_URL: str
 
+    # Logging: "text" (colorized, written synchronously; development) or
+    # "json" (one object per line with the request id, written by a background
+    # thread through a queue of LOG_QUEUE_SIZE records; drops when full).
+    # LOG_SAMPLE_RATES / LOG_RATE_LIMITS are JSON objects keyed by logger name
+    # (children included): fraction of records below WARNING kept, and
+    # records per second, e.g. {"uvicorn.access": 0.1}
+    LOG_FORMAT: str = Field(default="text", alias="LOG_FORMAT")
+    LOG_LEVEL: str = Field(default="INFO", alias="LOG_LEVEL")
+    LOG_QUEUE_SIZE: int = Field(default=10_000, alias="LOG_QUEUE_SIZE")
+    LOG_SAMPLE_RATES: dict[str, float] = Field(default_factory=dict, alias="LOG_SAMPLE_RATES")
+    LOG_RATE_LIMITS: dict[str, float] = Field(default_factory=dict, alias="LOG_RATE_LIMITS")
+
+    # Startup: database wait (jittered exponential backoff up to
+    # STARTUP_DB_RETRY_MAX_WAIT_SECONDS between tries, gives up after
+    # STARTUP_DB_WAIT_SECONDS) and one-at-a-time bootstrap under an advisory lock
+    STARTUP_DB_WAIT_SECONDS: float = Field(default=60.0, alias="STARTUP_DB_WAIT_SECONDS")
+    STARTUP_DB_RETRY_MAX_WAIT_SECONDS: float = Field(default=5.0, alias="STARTUP_DB_RETRY_MAX_WAIT_SECONDS")
+    STARTUP_BOOTSTRAP_LOCK_TIMEOUT_SECONDS: float = Field(default=120.0, alias="STARTUP_BOOTSTRAP_LOCK_TIMEOUT_SECONDS")
+    READINESS_DB_TIMEOUT_SECONDS: float = Field(default=2.0, alias="READINESS_DB_TIMEOUT_SECONDS")
+
+    # Connection pool of async_engine (per worker)
+    DB_POOL_SIZE: int = Field(default=10, alias="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=20, alias="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT_SECONDS: float = Field(default=30.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    # Connections opened (and hot statements primed) per worker at startup,
+    # up to DB_POOL_SIZE; 0 leaves the pool to fill on demand
+    DB_POOL_WARMUP_CONNECTIONS: int = Field(default=2, alias="DB_POOL_WARMUP_CONNECTIONS")
+    DB_POOL_WARMUP_TIMEOUT_SECONDS: float = Field(default=10.0, alias="DB_POOL_WARMUP_TIMEOUT_SECONDS")
+    # Graceful shutdown: wait this long for in-flight requests before stopping
+    # background tasks and closing the pools
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = Field(default=10.0, alias="SHUTDOWN_DRAIN_TIMEOUT_SECONDS")
+
+    # Statement caches: prepared statements kept per connection (the app has
+    # far fewer distinct statements, so nothing is evicted). DB_PGBOUNCER_MODE
+    # disables them for PgBouncer transaction pooling
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = Field(default=256, alias="DB_PREPARED_STATEMENT_CACHE_SIZE")
+    DB_PGBOUNCER_MODE: bool = Field(default=False, alias="DB_PGBOUNCER_MODE")
+
+    # Optional read replica (empty = everything on DATABASE_URL). Read-only
+    # queries fall back to the primary while the replica is down or more
+    # than REPLICA_MAX_LAG_SECONDS behind
+    DATABASE_REPLICA_URL: str = Field(default="", alias="DATABASE_REPLICA_URL")
+    REPLICA_MAX_LAG_SECONDS: float = Field(default=5.0, alias="REPLICA_MAX_LAG_SECONDS")
+    REPLICA_CHECK_INTERVAL_SECONDS: float = Field(default=5.0, alias="REPLICA_CHECK_INTERVAL_SECONDS")
+
+    # Admission control: shed load with 503 + Retry-After before requests
+    # queue on the pool. Concurrency budget per worker (0 = pool capacity)
+    # and pool queue-delay budget; low priority routes get a smaller share
+    ADMISSION_ENABLED: bool = Field(default=True, alias="ADMISSION_ENABLED")
+    ADMISSION_MAX_CONCURRENT: int = Field(default=0, alias="ADMISSION_MAX_CONCURRENT")
+    ADMISSION_MAX_POOL_WAIT_MS: float = Field(default=500.0, alias="ADMISSION_MAX_POOL_WAIT_MS")
+    ADMISSION_RETRY_AFTER_SECONDS: int = Field(default=1, alias="ADMISSION_RETRY_AFTER_SECONDS")
+
+    # Password hashing pool
+    HASH_POOL_MODE: str = Field(default="thread", alias="HASH_POOL_MODE")
+    HASH_POOL_WORKERS: int = Field(default=4, alias="HASH_POOL_WORKERS")
+    HASH_POOL_MAX_QUEUE: int = Field(default=32, alias="HASH_POOL_MAX_QUEUE")
+
+    # Login rate limiting (token buckets per client IP and per username, both
+    # charged before any password hash; a successful login gets its username
+    # token back). Workers share buckets through LOGIN_RATE_LIMIT_FILE
+    # (start() picks a temporary file when unset); without a file each
+    # worker limits on its own
+    LOGIN_RATE_LIMIT_ENABLED: bool = Field(default=True, alias="LOGIN_RATE_LIMIT_ENABLED")
+    LOGIN_RATE_LIMIT_FILE: str = Field(default="", alias="LOGIN_RATE_LIMIT_FILE")
+    LOGIN_RATE_LIMIT_SLOTS: int = Field(default=65536, alias="LOGIN_RATE_LIMIT_SLOTS")
+    LOGIN_RATE_LIMIT_USERNAME_BURST: float = Field(default=5, alias="LOGIN_RATE_LIMIT_USERNAME_BURST")
+    LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE: float = Field(default=5, alias="LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE")
+    LOGIN_RATE_LIMIT_IP_BURST: float = Field(default=20, alias="LOGIN_RATE_LIMIT_IP_BURST")
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = Field(default=60, alias="LOGIN_RATE_LIMIT_IP_PER_MINUTE")
+
+    # Authenticated user cache (TTL is the staleness window, 0 disables it)
+    USER_CACHE_MAXSIZE: int = Field(default=10_000, alias="USER_CACHE_MAXSIZE")
+    USER_CACHE_TTL_SECONDS: float = Field(default=30.0, alias="USER_CACHE_TTL_SECONDS")
+
+    # Verified JWT payload cache (entries also expire with the token's exp)
+    TOKEN_CACHE_MAXSIZE: int = Field(default=10_000, alias="TOKEN_CACHE_MAXSIZE")
+    TOKEN_CACHE_MAX_TTL_SECONDS: float = Field(default=900.0, alias="TOKEN_CACHE_MAX_TTL_SECONDS")
+
+    # Cross-worker cache invalidation over LISTEN/NOTIFY. LISTEN needs a
+    # session-level connection: behind PgBouncer in transaction mode, point
+    # CACHE_INVALIDATION_LISTEN_URL at Postgres directly
+    CACHE_INVALIDATION_ENABLED: bool = Field(default=True, alias="CACHE_INVALIDATION_ENABLED")
+    CACHE_INVALIDATION_LISTEN_URL: str = Field(default="", alias="CACHE_INVALIDATION_LISTEN_URL")
+    CACHE_INVALIDATION_KEEPALIVE_SECONDS: float = Field(default=30.0, alias="CACHE_INVALIDATION_KEEPALIVE_SECONDS")
+
+    # Write-behind buffer for user_sessions.last_activity
+    SESSION_ACTIVITY_FLUSH_INTERVAL_SECONDS: float = Field(default=5.0, alias="SESSION_ACTIVITY_FLUSH_INTERVAL_SECONDS")
+    SESSION_ACTIVITY_FLUSH_MAX_BATCH: int = Field(default=500, alias="SESSION_ACTIVITY_FLUSH_MAX_BATCH")
+
+    # Background reaper for expired / logged out sessions
+    SESSION_REAPER_ENABLED: bool = Field(default=True, alias="SESSION_REAPER_ENABLED")
+    SESSION_REAPER_INTERVAL_SECONDS: float = Field(default=300.0, alias="SESSION_REAPER_INTERVAL_SECONDS")
+    SESSION_REAPER_BATCH_SIZE: int = Field(default=1000, alias="SESSION_REAPER_BATCH_SIZE")
+    SESSION_REAPER_BATCH_PAUSE_SECONDS: float = Field(default=0.1, alias="SESSION_REAPER_BATCH_PAUSE_SECONDS")
+    SESSION_RETENTION_EXPIRED_DAYS: int = Field(default=0, alias="SESSION_RETENTION_EXPIRED_DAYS")
+    SESSION_RETENTION_LOGGED_OUT_DAYS: int = Field(default=7, alias="SESSION_RETENTION_LOGGED_OUT_DAYS")
+
+    # Dashboard statistics snapshot
+    STATS_SNAPSHOT_REFRESH_SECONDS: float = Field(default=30.0, alias="STATS_SNAPSHOT_REFRESH_SECONDS")
+
+    # Encode GET /users straight from database rows (pydantic_core)
+    # instead of re-validating every row through the response model
+    FAST_JSON_RESPONSES: bool = Field(default=False, alias="FAST_JSON_RESPONSES")
+
+    # Streaming exports (rows fetched per server-side cursor round trip)
+    EXPORT_CHUNK_ROWS: int = Field(default=1000, alias="EXPORT_CHUNK_ROWS")
+
+    # SQL observability (replaces echo=True): slow statements are always
+    # logged, others only for SQL_LOG_SAMPLE_RATE of executions (0 = none)
+    SQL_SLOW_QUERY_MS: float = Field(default=250.0, alias="SQL_SLOW_QUERY_MS")
+    SQL_LOG_SAMPLE_RATE: float = Field(default=0.0, alias="SQL_LOG_SAMPLE_RATE")
+    SQL_STATS_MAX_STATEMENTS: int = Field(default=500, alias="SQL_STATS_MAX_STATEMENTS")
+
+    # Per-request query accounting: Server-Timing header and N+1 warnings
+    # (a statement repeated more than SQL_N_PLUS_ONE_THRESHOLD times, 0 = off)
+    SERVER_TIMING_ENABLED: bool = Field(default=True, alias="SERVER_TIMING_ENABLED")
+    SQL_N_PLUS_ONE_THRESHOLD: int = Field(default=10, alias="SQL_N_PLUS_ONE_THRESHOLD")
+
+    # Prometheus /metrics. With several uvicorn workers each one writes its
+    # values to METRICS_DIR every METRICS_FLUSH_INTERVAL_SECONDS and a scrape
+    # merges them (start() picks a temporary directory when unset)
+    METRICS_ENABLED: bool = Field(default=True, alias="METRICS_ENABLED")
+    METRICS_DIR: str = Field(default="", alias="METRICS_DIR")
+    METRICS_FLUSH_INTERVAL_SECONDS: float = Field(default=5.0, alias="METRICS_FLUSH_INTERVAL_SECONDS")
+
+    # Bulk user import (rows validated, hashed and inserted per batch)
+    IMPORT_BATCH_SIZE: int = Field(default=500, alias="IMPORT_BATCH_SIZE")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
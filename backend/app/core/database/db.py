@@ -1,30 +1,79 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, MappedAsDataclass
 from sqlalchemy.engine import make_url
-from typing import AsyncGenerator
+from sqlalchemy import DateTime
+from datetime import datetime
+from typing import AsyncGenerator, Optional
 import asyncio
 
 from app.core.config import settings
+from app.core.database.observability import SQLObserver
+from app.core.database.pool import TimedAsyncAdaptedQueuePool
+from app.core.database.replica import ReplicaMonitor, RoutingSession
+from app.core.database.statement_cache import StatementCacheStats
+from app.core.metrics import track_engine_pool
 
 
-class Base(MappedAsDataclass, DeclarativeBase):...
+class Base(MappedAsDataclass, DeclarativeBase):
+    # the app writes timezone-aware UTC datetimes, so store them as timestamptz
+    type_annotation_map = {datetime: DateTime(timezone=True)}
 
 db_url = make_url(settings.DATABASE_URL)
 
-async_engine = create_async_engine(
-    db_url,
-    echo=True,
-    echo_pool=False,
-    pool_size=10,  # Tamanho do pool de conexões
-    max_overflow=20,  # Conexões adicionais além do pool_size
-    pool_timeout=30,  # Tempo de espera por uma conexão do pool (em segundos)
-    pool_recycle=1800,  # Tempo para reciclar uma conexão (em segundos)
-    pool_pre_ping=True,  # Habilita ping antes de usar a conexão do pool
+statement_cache = StatementCacheStats(
+    prepared_cache_size=settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    pgbouncer_mode=settings.DB_PGBOUNCER_MODE,
 )
 
+
+def _create_engine(url) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=False,
+        echo_pool=False,
+        poolclass=TimedAsyncAdaptedQueuePool,  # mede a espera por conexão do pool
+        pool_size=settings.DB_POOL_SIZE,  # Tamanho do pool de conexões
+        max_overflow=settings.DB_MAX_OVERFLOW,  # Conexões adicionais além do pool_size
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,  # Tempo de espera por uma conexão do pool (em segundos)
+        pool_recycle=1800,  # Tempo para reciclar uma conexão (em segundos)
+        pool_pre_ping=True,  # Habilita ping antes de usar a conexão do pool
+        connect_args=statement_cache.connect_args(),  # cache de prepared statements do asyncpg
+    )
+
+
+async_engine = _create_engine(db_url)
+
+# Réplica de leitura opcional (mesmas configurações de pool, por worker)
+replica_engine: Optional[AsyncEngine] = (
+    _create_engine(make_url(settings.DATABASE_REPLICA_URL)) if settings.DATABASE_REPLICA_URL else None
+)
+replica_monitor = ReplicaMonitor(
+    replica_engine,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_CHECK_INTERVAL_SECONDS,
+)
+
+sql_observer = SQLObserver(
+    slow_threshold_ms=settings.SQL_SLOW_QUERY_MS,
+    sample_rate=settings.SQL_LOG_SAMPLE_RATE,
+    max_statements=settings.SQL_STATS_MAX_STATEMENTS,
+)
+sql_observer.attach(async_engine)
+statement_cache.attach(async_engine)
+track_engine_pool(async_engine)
+if replica_engine is not None:
+    sql_observer.attach(replica_engine)
+    statement_cache.attach(replica_engine)
+
+
+class AppSession(RoutingSession):
+    monitor = replica_monitor
+
+
 local_session = sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
+    sync_session_class=AppSession,  # leituras com READ_REPLICA vão para a réplica
     expire_on_commit=False,
     autoflush=False,
     future=True,
@@ -36,6 +85,13 @@ async def async_get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield db_session
 
 
+async def dispose_engines() -> None:
+    """Close every pooled connection of this worker (primary and replica)"""
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
 # Função para criar todas as tabelas
 async def create_all_tables(engine: AsyncEngine):
     async with engine.begin() as conn:
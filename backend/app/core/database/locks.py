@@ -0,0 +1,40 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+# Postgres advisory lock keys, one per job that must run on a single worker
+SESSION_REAPER_LOCK = 742_001
+
+
+@asynccontextmanager
+async def advisory_lock(
+    engine: AsyncEngine, key: int, wait: bool = False
+) -> AsyncIterator[Optional[AsyncConnection]]:
+    """
+    Hold a session-level Postgres advisory lock on a dedicated connection.
+
+    Yields the connection holding the lock (sessions can be bound to it), or
+    ``None`` when ``wait`` is False and another worker already holds the lock.
+    The lock outlives individual transactions, so work done under it may
+    commit as often as it needs to.
+    """
+    async with engine.connect() as conn:
+        if wait:
+            await conn.execute(select(func.pg_advisory_lock(key)))
+            acquired = True
+        else:
+            acquired = await conn.scalar(select(func.pg_try_advisory_lock(key)))
+        await conn.commit()
+
+        if not acquired:
+            yield None
+            return
+
+        try:
+            yield conn
+        finally:
+            await conn.rollback()
+            await conn.execute(select(func.pg_advisory_unlock(key)))
+            await conn.commit()
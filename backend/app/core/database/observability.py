@@ -0,0 +1,184 @@
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.database.query_stats import current_query_stats
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_NUMBERED_PARAM = re.compile(r"\$\d+|%\(\w+\)s")
+# "?, ?, ?" from expanding IN lists -> "?, ..."
+_PARAM_LIST = re.compile(r"(\?(?:::[A-Z ]+)?)(?:\s*,\s*\?(?:::[A-Z ]+)?)+")
+# identical repeated groups, e.g. multi-row VALUES -> "(...), ..."
+_REPEATED_GROUP = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Statement text with parameters and variable-length lists folded, so every execution of the same query shares one key"""
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _NUMBERED_PARAM.sub("?", text)
+    text = _PARAM_LIST.sub(r"\1, ...", text)
+    return _REPEATED_GROUP.sub(r"\1, ...", text)
+
+
+def _shape(value) -> str:
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """Types (and lengths) of bound parameters - never their values, which may be passwords or tokens"""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {parameter_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {_shape(value)}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_shape(value) for value in parameters) + ")"
+    return _shape(parameters)
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    errors: int = 0
+    slow: int = 0
+    rows: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "slow": self.slow,
+            "rows": self.rows,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(self.total_seconds * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class SQLObserver:
+    """
+    Lightweight SQL observability hooked on the engine's cursor events.
+
+    Nothing is logged by default: statements slower than ``slow_threshold_ms``
+    are always logged (with their parameter shapes), other statements only
+    for a random ``sample_rate`` share. Every execution feeds per-fingerprint
+    timing aggregates, kept for at most ``max_statements`` distinct queries;
+    newer ones are folded into an ``<other>`` bucket. Aggregates are per worker.
+    Executions are also added to the current request's QueryStats, if any.
+    """
+
+    OTHER = "<other>"
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = 250.0,
+        sample_rate: float = 0.0,
+        max_statements: int = 500,
+    ):
+        self.slow_threshold = slow_threshold_ms / 1000 if slow_threshold_ms > 0 else None
+        self.sample_rate = sample_rate
+        self.max_statements = max_statements
+        self.statements: dict[str, StatementStats] = {}
+        self.since = time.time()
+
+    def attach(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def _stats_for(self, statement: str) -> StatementStats:
+        key = fingerprint(statement)
+        stats = self.statements.get(key)
+        if stats is None:
+            if len(self.statements) >= self.max_statements:
+                key = self.OTHER
+            stats = self.statements.setdefault(key, StatementStats())
+        return stats
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._sql_started_at = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, "_sql_started_at", None)
+        if started_at is None:
+            return
+        elapsed = time.perf_counter() - started_at
+        rowcount = max(getattr(cursor, "rowcount", 0) or 0, 0)
+
+        request_stats = current_query_stats()
+        if request_stats is not None:
+            request_stats.record_query(fingerprint(statement), elapsed)
+
+        stats = self._stats_for(statement)
+        stats.count += 1
+        stats.rows += rowcount
+        stats.total_seconds += elapsed
+        if elapsed > stats.max_seconds:
+            stats.max_seconds = elapsed
+
+        if self.slow_threshold is not None and elapsed >= self.slow_threshold:
+            stats.slow += 1
+            logger.warning(
+                "Slow SQL (%.1f ms, %d rows): %s | params: %s",
+                elapsed * 1000,
+                rowcount,
+                fingerprint(statement),
+                parameter_shape(parameters, executemany),
+            )
+        elif self.sample_rate and random.random() < self.sample_rate:
+            logger.info(
+                "SQL (%.1f ms, %d rows): %s | params: %s",
+                elapsed * 1000,
+                rowcount,
+                fingerprint(statement),
+                parameter_shape(parameters, executemany),
+            )
+
+    def _handle_error(self, exception_context) -> None:
+        statement = exception_context.statement
+        if statement is None:
+            return
+        self._stats_for(statement).errors += 1
+        context = exception_context.execution_context
+        started_at = getattr(context, "_sql_started_at", None)
+        elapsed = time.perf_counter() - started_at if started_at is not None else 0.0
+        logger.warning(
+            "SQL failed after %.1f ms: %s | params: %s | %s",
+            elapsed * 1000,
+            fingerprint(statement),
+            parameter_shape(exception_context.parameters, getattr(context, "executemany", False)),
+            type(exception_context.original_exception).__name__,
+        )
+
+    def stats(self, sort: str = "total_ms", limit: Optional[int] = 50) -> dict:
+        statements = sorted(
+            ({"statement": key, **stats.as_dict()} for key, stats in self.statements.items()),
+            key=lambda entry: entry[sort],
+            reverse=True,
+        )
+        return {
+            "since": self.since,
+            "slow_threshold_ms": self.slow_threshold * 1000 if self.slow_threshold else None,
+            "sample_rate": self.sample_rate,
+            "fingerprints": len(self.statements),
+            "statements": statements[:limit] if limit else statements,
+        }
+
+    def reset(self) -> None:
+        self.statements.clear()
+        self.since = time.time()
@@ -0,0 +1,79 @@
+import math
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.database.query_stats import current_query_stats
+from app.core.metrics import DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_CHECKOUT_WAIT
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default asyncio queue pool, timing every checkout: how long the caller
+    waited for a free (or newly opened, pre-pinged) connection. Each wait is
+    added to the current request's QueryStats and to pool-wide totals, and to
+    a moving average that admission control reads as the pool's queue delay.
+    """
+
+    # weight of the newest wait in the moving average, and how fast it fades
+    # once checkouts stop (so a burst of slow waits does not shed load forever)
+    EWMA_ALPHA = 0.2
+    EWMA_DECAY_SECONDS = 1.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self._ewma_wait = 0.0
+        self._ewma_updated_at = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.size() + max(self._max_overflow, 0)
+
+    def recent_wait(self) -> float:
+        """Moving average of checkout wait in seconds, fading since the last checkout"""
+        idle = time.perf_counter() - self._ewma_updated_at
+        return self._ewma_wait * math.exp(-idle / self.EWMA_DECAY_SECONDS)
+
+    def connect(self):
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            self.waiting -= 1
+            now = time.perf_counter()
+            elapsed = now - start
+            self._ewma_wait = self.EWMA_ALPHA * elapsed + (1 - self.EWMA_ALPHA) * self.recent_wait()
+            self._ewma_updated_at = now
+            self.checkouts += 1
+            self.wait_seconds += elapsed
+            if elapsed > self.max_wait_seconds:
+                self.max_wait_seconds = elapsed
+            DB_POOL_CHECKOUT_WAIT.observe(elapsed)
+            stats = current_query_stats()
+            if stats is not None:
+                stats.record_checkout(elapsed)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "capacity": self.capacity,
+            "waiting": self.waiting,
+            "recent_wait_ms": round(self.recent_wait() * 1000, 3),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.wait_seconds * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
@@ -0,0 +1,77 @@
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterator, Optional
+
+
+@dataclass
+class QueryStats:
+    """
+    Database work done on behalf of one unit of work (usually a request).
+
+    Trackers nest: whatever is recorded in an inner tracker is also recorded
+    in the enclosing one, so a caller can budget a whole in-process request.
+    """
+
+    queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    checkouts: int = 0
+    fingerprints: Counter = field(default_factory=Counter)
+    parent: Optional["QueryStats"] = field(default=None, repr=False)
+
+    def record_query(self, fingerprint: str, seconds: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.queries += 1
+            stats.db_seconds += seconds
+            stats.fingerprints[fingerprint] += 1
+            stats = stats.parent
+
+    def record_checkout(self, seconds: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.checkouts += 1
+            stats.pool_wait_seconds += seconds
+            stats = stats.parent
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Fingerprints executed more than ``threshold`` times - likely N+1 loops"""
+        return [(key, count) for key, count in self.fingerprints.most_common() if count > threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Account every statement and pool checkout made in this context (and the tasks it spawns)"""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@asynccontextmanager
+async def assert_max_queries(max_queries: int) -> AsyncIterator[QueryStats]:
+    """
+    Fail with AssertionError if the wrapped block runs more than ``max_queries``
+    statements, listing what ran. Works around in-process ASGI calls too:
+
+        async with assert_max_queries(6):
+            await client.post("/auth/login", data=credentials)
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.queries > max_queries:
+        executed = "\n".join(f"  {count} x {key}" for key, count in stats.fingerprints.most_common())
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, {stats.queries} were executed:\n{executed}"
+        )
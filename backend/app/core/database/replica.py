@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Pass as ``bind_arguments`` to route a read-only statement to the replica:
+#     await session.execute(stmt, bind_arguments=READ_REPLICA)
+READ_REPLICA = {"replica": True}
+
+# Seconds the replica is behind. Zero on a primary (a second database used
+# as a stand-in) and when every received WAL record has been replayed, since
+# replay timestamps only advance with new writes.
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """
+    Health and lag of the optional read replica.
+
+    The replica is used only while the last check succeeded and its lag is
+    within ``max_lag_seconds``; a disconnect seen by any query marks it down
+    immediately. Until the first successful check, reads stay on the primary.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine],
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 5.0,
+        check_timeout: float = 2.0,
+    ):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self.checks = 0
+        self.failed_checks = 0
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self._task: Optional[asyncio.Task] = None
+        if engine is not None:
+            event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    @property
+    def configured(self) -> bool:
+        return self.engine is not None
+
+    @property
+    def available(self) -> bool:
+        return self.engine is not None and self.healthy
+
+    def _set_healthy(self, healthy: bool, reason: Optional[str] = None) -> None:
+        if healthy != self.healthy:
+            if healthy:
+                logger.info("Read replica available (lag %.2fs).", self.lag_seconds or 0.0)
+            else:
+                logger.warning("Read replica unavailable, reading from primary: %s", reason)
+        self.healthy = healthy
+        self.last_error = None if healthy else reason
+
+    def _on_error(self, exception_context) -> None:
+        if exception_context.is_disconnect:
+            self._set_healthy(False, f"disconnect: {exception_context.original_exception}")
+
+    async def check(self) -> bool:
+        if self.engine is None:
+            return False
+        self.checks += 1
+        self.checked_at = time.time()
+        try:
+            async with asyncio.timeout(self.check_timeout):
+                async with self.engine.connect() as conn:
+                    self.lag_seconds = float(await conn.scalar(REPLICA_LAG_SQL))
+        except Exception as e:
+            self.failed_checks += 1
+            self.lag_seconds = None
+            self._set_healthy(False, f"{type(e).__name__}: {e}")
+            return False
+
+        if self.lag_seconds > self.max_lag_seconds:
+            self._set_healthy(False, f"lag {self.lag_seconds:.2f}s > {self.max_lag_seconds}s")
+        else:
+            self._set_healthy(True)
+        return self.healthy
+
+    def route(self, wants_replica: bool) -> bool:
+        """Whether a read that asked for the replica can use it right now"""
+        if not wants_replica or self.engine is None:
+            return False
+        if self.healthy:
+            self.replica_reads += 1
+            return True
+        self.primary_fallbacks += 1
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        if self.engine is not None and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="replica-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "configured": self.configured,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "last_error": self.last_error,
+            "checked_at": self.checked_at,
+            "checks": self.checks,
+            "failed_checks": self.failed_checks,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads marked with ``READ_REPLICA`` to the replica.
+
+    Read-your-writes: once the session has flushed or executed a DML
+    statement on the primary, every later read in it (i.e. in the request)
+    goes to the primary too, even if it asked for the replica.
+    """
+
+    monitor: Optional[ReplicaMonitor] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.has_written = False
+
+    def get_bind(self, mapper=None, *, clause=None, replica: bool = False, **kw):
+        if replica and not self.has_written and self.monitor is not None:
+            if self.monitor.route(True):
+                return self.monitor.engine.sync_engine
+        elif self._flushing or getattr(clause, "is_dml", False):
+            self.has_written = True
+        return super().get_bind(mapper, clause=clause, **kw)
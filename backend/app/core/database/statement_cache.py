@@ -0,0 +1,86 @@
+import uuid
+from collections import Counter as CounterDict
+
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import DB_PREPARED_STATEMENTS, SQL_COMPILED_CACHE
+
+_CACHE_RESULTS = {
+    CacheStats.CACHE_HIT: "hit",
+    CacheStats.CACHE_MISS: "miss",
+    CacheStats.CACHING_DISABLED: "disabled",
+    CacheStats.NO_CACHE_KEY: "no_key",
+    CacheStats.NO_DIALECT_SUPPORT: "no_dialect_support",
+}
+
+
+class StatementCacheStats:
+    """
+    Hit rates of the two statement caches on the way to Postgres:
+
+    * SQLAlchemy's compiled cache (per engine, ``query_cache_size`` entries):
+      a miss means the statement was compiled to SQL again;
+    * the asyncpg dialect's prepared statement cache (per connection,
+      ``prepared_statement_cache_size`` entries): a miss costs a Parse round
+      trip. Counted through ``prepared_statement_name_func``, which the dialect
+      calls exactly once per prepare.
+    """
+
+    def __init__(self, prepared_cache_size: int = 100, pgbouncer_mode: bool = False):
+        self.prepared_cache_size = 0 if pgbouncer_mode else prepared_cache_size
+        self.pgbouncer_mode = pgbouncer_mode
+        self.compiled = CounterDict()
+        self.executions = 0
+        self.prepares = 0
+        self._engines: list[AsyncEngine] = []
+
+    def connect_args(self) -> dict:
+        """asyncpg DBAPI arguments for ``create_async_engine(connect_args=...)``"""
+        args = {
+            "prepared_statement_cache_size": self.prepared_cache_size,
+            "prepared_statement_name_func": self._statement_name,
+        }
+        if self.pgbouncer_mode:
+            # PgBouncer (transaction pooling) may run the next transaction on
+            # another server connection: no statement may outlive a
+            # transaction and names must never collide between clients
+            args["statement_cache_size"] = 0
+        return args
+
+    def _statement_name(self):
+        self.prepares += 1
+        DB_PREPARED_STATEMENTS.inc()
+        if self.pgbouncer_mode:
+            return f"__asyncpg_{uuid.uuid4().hex}__"
+        return None  # asyncpg numbers them per connection
+
+    def attach(self, engine: AsyncEngine) -> None:
+        self._engines.append(engine)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.executions += 1
+        result = _CACHE_RESULTS.get(getattr(context, "cache_hit", None), "none")
+        self.compiled[result] += 1
+        SQL_COMPILED_CACHE.inc(result=result)
+
+    def stats(self) -> dict:
+        compiled_total = self.compiled["hit"] + self.compiled["miss"]
+        return {
+            "compiled_cache": {
+                "results": dict(self.compiled),
+                "hit_ratio": round(self.compiled["hit"] / compiled_total, 4) if compiled_total else None,
+                "entries": [len(engine.sync_engine._compiled_cache or ()) for engine in self._engines],
+            },
+            "prepared_statements": {
+                "pgbouncer_mode": self.pgbouncer_mode,
+                "cache_size_per_connection": self.prepared_cache_size,
+                "executions": self.executions,
+                "prepares": self.prepares,
+                "hit_ratio": (
+                    round(max(1 - self.prepares / self.executions, 0.0), 4) if self.executions else None
+                ),
+            },
+        }
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.orm import sessionmaker
+
+from app.repositories.statements import (
+    ACTIVE_SESSION_BY_REFRESH_TOKEN,
+    ACTIVE_SESSION_BY_TOKEN,
+    SESSION_BY_TOKEN,
+    USER_BY_USERNAME,
+    USER_VERSION_BY_ID,
+)
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# The hot lookups with placeholder values that match nothing: running them
+# fills the engine's compiled cache, asyncpg's type introspection (the
+# userrole enum) and each connection's prepared statement cache
+PRIMED_STATEMENTS = (
+    (USER_BY_USERNAME, {"username": ""}),
+    (USER_VERSION_BY_ID, {"user_id": 0}),
+    (SESSION_BY_TOKEN, {"session_token": ""}),
+    (ACTIVE_SESSION_BY_TOKEN, {"session_token": "", "now": _EPOCH}),
+    (ACTIVE_SESSION_BY_REFRESH_TOKEN, {"refresh_token": "", "now": _EPOCH}),
+)
+
+
+async def warm_up_pool(
+    engine: AsyncEngine,
+    session_factory: sessionmaker,
+    connections: int,
+    timeout: float = 10.0,
+) -> dict:
+    """
+    Open ``connections`` pool connections concurrently, prime the hot
+    statements on each one through a session (the same path requests take)
+    and return them to the pool, so the first requests after a deploy skip
+    connection setup. Best effort: failures are logged, never raised.
+    """
+    opened: list[AsyncConnection] = []
+    primed = 0
+
+    async def open_one() -> None:
+        # recorded as soon as it is open, so a timeout mid-gather still closes it
+        connection = await engine.connect().start()
+        opened.append(connection)
+
+    try:
+        async with asyncio.timeout(timeout):
+            results = await asyncio.gather(
+                *(open_one() for _ in range(connections)),
+                return_exceptions=True,
+            )
+            for error in (result for result in results if isinstance(result, BaseException)):
+                logger.warning("Pool warm-up could not open a connection: %s", error)
+            for connection in opened:
+                async with session_factory(bind=connection) as session:
+                    for statement, params in PRIMED_STATEMENTS:
+                        await session.execute(statement, params)
+                        primed += 1
+    except Exception as e:
+        logger.warning("Pool warm-up stopped early (%s: %s).", type(e).__name__, e)
+    finally:
+        for connection in opened:
+            await connection.close()
+    return {"connections": len(opened), "primed_statements": primed}
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDrain:
+    """
+    Counts HTTP requests in flight on this worker so shutdown can wait for
+    them (and the work they hand to background flushers) before the pool is
+    closed under them.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def enter(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def exit(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for in-flight requests; False if some were still running"""
+        if self.in_flight:
+            logger.info("Draining %d in-flight requests...", self.in_flight)
+        try:
+            async with asyncio.timeout(timeout):
+                await self._idle.wait()
+            return True
+        except TimeoutError:
+            logger.warning("Shutdown drain timed out with %d requests in flight.", self.in_flight)
+            return False
+
+
+class RequestDrainMiddleware:
+    def __init__(self, app: ASGIApp, drain: RequestDrain):
+        self.app = app
+        self.drain = drain
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.drain.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.drain.exit()
+
+
+request_drain = RequestDrain()
+
+
+def setup_request_drain(app):
+    app.add_middleware(RequestDrainMiddleware, drain=request_drain)
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import bcrypt
+
+from app.core.config import settings
+from app.core.metrics import BCRYPT_DURATION
+from app.exceptions.exceptions import HashingPoolSaturated
+
+
+def _hashpw(password: str) -> tuple[str, float]:
+    start = time.perf_counter()
+    hashed_bytes = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    return hashed_bytes.decode("utf-8"), time.perf_counter() - start
+
+
+def _checkpw(plain_password: str, hashed_password: str) -> tuple[bool, float]:
+    start = time.perf_counter()
+    try:
+        valid = bcrypt.checkpw(
+            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
+    except Exception:
+        valid = False
+    return valid, time.perf_counter() - start
+
+
+@dataclass
+class Timing:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total_seconds, 6),
+            "avg_seconds": round(self.total_seconds / self.count, 6) if self.count else 0.0,
+            "max_seconds": round(self.max_seconds, 6),
+        }
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop in a bounded thread or process pool.
+
+    At most ``workers + max_queue`` jobs are accepted at once; anything beyond
+    that fails fast with ``HashingPoolSaturated`` instead of piling up.
+    """
+
+    def __init__(self, mode: str = "thread", workers: int = 4, max_queue: int = 32):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Invalid hashing pool mode: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self.bulk_pending = 0
+        self.rejected = 0
+        self.wait = Timing()
+        self.hash_timing = Timing()
+        self.verify_timing = Timing()
+        self._executor: Executor | None = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _execute(self, timing: Timing, fn, *args):
+        submitted = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        result, elapsed = await loop.run_in_executor(self._get_executor(), fn, *args)
+        self.wait.observe(max(time.perf_counter() - submitted - elapsed, 0.0))
+        timing.observe(elapsed)
+        BCRYPT_DURATION.observe(elapsed, operation="hash" if fn is _hashpw else "verify")
+        return result
+
+    async def _run(self, timing: Timing, fn, *args):
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise HashingPoolSaturated(
+                message="Authentication service is busy, try again shortly."
+            )
+
+        self.pending += 1
+        try:
+            return await self._execute(timing, fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hash_timing, _hashpw, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            self.verify_timing, _checkpw, plain_password, hashed_password
+        )
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """
+        Hash a batch in parallel on every pool worker. Bulk jobs wait for a free
+        worker instead of failing fast, and are not counted against the
+        interactive queue limit, so a large import never turns logins into 503s.
+        """
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def _hash_one(password: str) -> str:
+            async with semaphore:
+                self.bulk_pending += 1
+                try:
+                    return await self._execute(self.hash_timing, _hashpw, password)
+                finally:
+                    self.bulk_pending -= 1
+
+        return await asyncio.gather(*(_hash_one(password) for password in passwords))
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self.pending,
+            "bulk_pending": self.bulk_pending,
+            "rejected": self.rejected,
+            "wait": self.wait.as_dict(),
+            "hash": self.hash_timing.as_dict(),
+            "verify": self.verify_timing.as_dict(),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    mode=settings.HASH_POOL_MODE,
+    workers=settings.HASH_POOL_WORKERS,
+    max_queue=settings.HASH_POOL_MAX_QUEUE,
+)
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import uuid
+from enum import Enum
+from typing import Iterable, Optional
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.core.metrics import CACHE_INVALIDATIONS
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "mateup_cache_invalidation"
+
+# Identifies this worker's own notifications, which it skips: the service
+# that made the change already evicted locally, synchronously
+ORIGIN = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+# NOTIFY payloads are limited to 8000 bytes; bigger changes flush everything
+MAX_KEYS_PER_EVENT = 200
+
+NOTIFY_SQL = text("SELECT pg_notify(:channel, :payload)")
+
+
+class CacheEvent(str, Enum):
+    user_updated = "user_updated"
+    user_deactivated = "user_deactivated"
+    user_deleted = "user_deleted"
+    sessions_revoked = "sessions_revoked"
+
+
+# Published for the first cache keyed on session state, but no cache here
+# depends on sessions yet: listeners only count them
+NO_OP_EVENTS = frozenset({CacheEvent.sessions_revoked.value})
+
+
+async def publish(
+    session: AsyncSession,
+    event: CacheEvent,
+    user_ids: Iterable[int] = (),
+    usernames: Iterable[str] = (),
+) -> None:
+    """
+    Queue a change event in the session's current transaction. Postgres
+    delivers it to every listening worker when the transaction commits and
+    drops it on rollback, so call it before the repository's commit.
+    """
+    if not settings.CACHE_INVALIDATION_ENABLED:
+        return
+    user_ids = sorted(set(user_ids))
+    usernames = sorted(set(usernames))
+    message = {"origin": ORIGIN, "event": event.value}
+    if len(user_ids) + len(usernames) > MAX_KEYS_PER_EVENT:
+        message["all"] = True
+    else:
+        message["user_ids"] = user_ids
+        message["usernames"] = usernames
+    await session.execute(NOTIFY_SQL, {"channel": CHANNEL, "payload": json.dumps(message)})
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class InvalidationListener:
+    """
+    One dedicated LISTEN connection per worker (outside the pool) that evicts
+    this worker's caches when another worker publishes a change.
+
+    Notifications sent while the connection is down are lost, so every
+    (re)subscribe starts with a full flush of the caches. The connection is
+    re-established with jittered exponential backoff and probed every
+    ``keepalive`` seconds so a silently dropped TCP connection is noticed.
+
+    Only user principals depend on user rows; the token cache holds signature
+    verification results, which a user change does not affect. Nothing
+    cached depends on sessions yet, so session events evict nothing.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        keepalive: float = 30.0,
+        min_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self.dsn = dsn
+        self.keepalive = keepalive
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.connected = False
+        self.connects = 0
+        self.connect_failures = 0
+        self.received = 0
+        self.skipped_own = 0
+        self.full_flushes = 0
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def flush(self, reason: str) -> None:
+        user_cache.clear()
+        self.full_flushes += 1
+        CACHE_INVALIDATIONS.inc(event="full_flush")
+        logger.info("Caches flushed (%s).", reason)
+
+    def apply(self, message: dict) -> None:
+        if message.get("event") in NO_OP_EVENTS:
+            CACHE_INVALIDATIONS.inc(event=message["event"])
+            return
+        if message.get("all"):
+            self.flush(f"{message.get('event')} affecting many users")
+            return
+        for user_id in message.get("user_ids", ()):
+            user_cache.evict(user_id=user_id)
+        for username in message.get("usernames", ()):
+            user_cache.evict(username=username)
+        CACHE_INVALIDATIONS.inc(event=message.get("event", "unknown"))
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation: %r", payload[:200])
+            return
+        if message.get("origin") == ORIGIN:
+            self.skipped_own += 1
+            return
+        self.received += 1
+        self.apply(message)
+
+    async def _listen_once(self) -> None:
+        connection = await asyncpg.connect(self.dsn)
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+        try:
+            await connection.add_listener(CHANNEL, self._on_notification)
+            self.connected = True
+            self.connects += 1
+            self.flush("listener subscribed" if self.connects == 1 else "listener reconnected")
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    await asyncio.wait_for(connection.execute("SELECT 1"), timeout=self.keepalive)
+        finally:
+            self.connected = False
+            connection.terminate()
+
+    async def _run(self) -> None:
+        backoff = self.min_backoff
+        while True:
+            connects = self.connects
+            try:
+                await self._listen_once()
+                self.last_error = "connection lost"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+            if self.connects > connects:
+                backoff = self.min_backoff  # it was up: retry quickly
+            else:
+                self.connect_failures += 1
+            logger.warning(
+                "Cache invalidation listener down (%s), reconnecting in %.1fs.",
+                self.last_error,
+                backoff,
+            )
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="cache-invalidation-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "origin": ORIGIN,
+            "connected": self.connected,
+            "connects": self.connects,
+            "connect_failures": self.connect_failures,
+            "received": self.received,
+            "skipped_own": self.skipped_own,
+            "full_flushes": self.full_flushes,
+            "last_error": self.last_error,
+        }
+
+
+invalidation_listener = InvalidationListener(
+    _asyncpg_dsn(settings.CACHE_INVALIDATION_LISTEN_URL or settings.DATABASE_URL),
+    keepalive=settings.CACHE_INVALIDATION_KEEPALIVE_SECONDS,
+)
@@ -0,0 +1,379 @@
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+from typing import Callable, Iterable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BCRYPT_BUCKETS = (0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0)
+STARTUP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> list:
+        return [[list(key), value] for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Gauges are summed over live workers only; a dead worker's last value is dropped."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # per-bucket (non cumulative) counts + the +Inf bucket, then sum
+            state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+        state["counts"][bisect.bisect_left(self.buckets, value)] += 1
+        state["sum"] += value
+
+    def snapshot(self) -> list:
+        # copies: the snapshot is written from a thread while the loop observes
+        return [
+            [list(key), {"counts": list(state["counts"]), "sum": state["sum"]}]
+            for key, state in self._values.items()
+        ]
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics with Prometheus text exposition.
+
+    With ``directory`` set (one shared directory for all uvicorn workers),
+    every worker periodically writes a JSON snapshot of its own values to
+    ``<directory>/<pid>.json`` and a scrape on any worker merges all files:
+    counters and histograms are summed over every worker that ever ran,
+    gauges over live workers only. Without a directory only this process is
+    reported.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 5.0):
+        self.directory = directory or None
+        self.flush_interval = flush_interval
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Callback run before every snapshot, to refresh gauges from their source"""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.error("Metrics collector failed: %s", e)
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    # multiprocess files
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"{pid}.json")
+
+    def _write(self, metrics: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pid": os.getpid(), "written_at": time.time(), "metrics": metrics}, f)
+        os.replace(tmp_path, path)
+
+    def write(self) -> None:
+        if self.directory is not None:
+            self._write(self.snapshot())
+
+    async def write_async(self) -> None:
+        """write() with the file I/O off the event loop; the values are read on it"""
+        if self.directory is not None:
+            await asyncio.to_thread(self._write, self.snapshot())
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _snapshots(self, own: dict) -> list[tuple[dict, bool]]:
+        if self.directory is None:
+            return [(own, True)]
+        self._write(own)
+        snapshots = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue  # being replaced or truncated - the next scrape gets it
+            snapshots.append((data["metrics"], self._is_alive(data["pid"])))
+        return snapshots
+
+    def _merge(self, own: dict) -> dict[str, dict[tuple, object]]:
+        merged: dict[str, dict[tuple, object]] = {name: {} for name in self._metrics}
+        for metrics, alive in self._snapshots(own):
+            for name, samples in metrics.items():
+                metric = self._metrics.get(name)
+                if metric is None or (metric.type == "gauge" and not alive):
+                    continue
+                values = merged[name]
+                for labels, value in samples:
+                    key = tuple(labels)
+                    if metric.type == "histogram":
+                        state = values.setdefault(key, {"counts": [0] * (len(metric.buckets) + 1), "sum": 0.0})
+                        state["counts"] = [a + b for a, b in zip(state["counts"], value["counts"])]
+                        state["sum"] += value["sum"]
+                    else:
+                        values[key] = values.get(key, 0.0) + value
+        return merged
+
+    def _render(self, own: dict) -> str:
+        lines = []
+        for name, values in self._merge(own).items():
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for key, value in sorted(values.items()):
+                if metric.type != "histogram":
+                    lines.append(f"{name}{_format_labels(metric.labelnames, key)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip((*metric.buckets, float("inf")), value["counts"]):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{name}_bucket{_format_labels(metric.labelnames, key, le)} {cumulative}")
+                labels = _format_labels(metric.labelnames, key)
+                lines.append(f"{name}_sum{labels} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{labels} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def render(self) -> str:
+        return self._render(self.snapshot())
+
+    async def render_async(self) -> str:
+        """
+        render() for request handlers: this worker's values are snapshotted on
+        the event loop, the file I/O and the merge run in a thread
+        """
+        return await asyncio.to_thread(self._render, self.snapshot())
+
+    # background flush
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.write_async()
+            except OSError as e:
+                logger.error("Metrics snapshot write failed: %s", e)
+
+    def start(self) -> None:
+        if self.directory is not None and self._task is None:
+            self.write()
+            self._task = asyncio.create_task(self._run(), name="metrics-flush")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.directory is not None:
+            # last values; counters of exited workers keep counting in the totals
+            await self.write_async()
+
+
+def reset_multiprocess_directory(directory: str) -> None:
+    """Remove snapshots of a previous server run. Call once, before workers start."""
+    os.makedirs(directory, exist_ok=True)
+    for entry in os.scandir(directory):
+        if entry.name.endswith((".json", ".json.tmp")):
+            os.remove(entry.path)
+
+
+registry = MetricsRegistry(
+    directory=settings.METRICS_DIR,
+    flush_interval=settings.METRICS_FLUSH_INTERVAL_SECONDS,
+)
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ("method",),
+)
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the async_engine pool.",
+)
+DB_POOL_OVERFLOW = registry.gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond pool_size.",
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled (or new) database connection.",
+    buckets=POOL_WAIT_BUCKETS,
+)
+DB_POOL_CHECKOUT_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total",
+    "Pool checkouts that gave up after pool_timeout.",
+)
+SQL_COMPILED_CACHE = registry.counter(
+    "sqlalchemy_compiled_cache_total",
+    "Statement executions by SQLAlchemy compiled cache result (hit, miss, ...).",
+    ("result",),
+)
+DB_PREPARED_STATEMENTS = registry.counter(
+    "db_prepared_statements_total",
+    "Statements prepared on a connection (prepared statement cache misses).",
+)
+BCRYPT_DURATION = registry.histogram(
+    "bcrypt_duration_seconds",
+    "bcrypt hash / verify time on the hashing pool.",
+    ("operation",),
+    buckets=BCRYPT_BUCKETS,
+)
+JWT_DECODE_FAILURES = registry.counter(
+    "jwt_decode_failures_total",
+    "JWTs rejected while decoding.",
+    ("token", "reason"),
+)
+AUTH_LOGINS = registry.counter(
+    "auth_logins_total",
+    "Login attempts by result.",
+    ("result", "reason"),
+)
+ADMISSION_IN_FLIGHT = registry.gauge(
+    "admission_in_flight_requests",
+    "Requests admitted by admission control and still running.",
+)
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected_total",
+    "Requests shed with 503 by admission control.",
+    ("priority", "reason"),
+)
+CACHE_INVALIDATIONS = registry.counter(
+    "cache_invalidations_total",
+    "Cache invalidation events applied from other workers, and full flushes.",
+    ("event",),
+)
+STARTUP_PHASE_DURATION = registry.histogram(
+    "startup_phase_duration_seconds",
+    "Worker startup time by phase (one observation per worker start).",
+    ("phase",),
+    buckets=STARTUP_BUCKETS,
+)
+LOG_RECORDS_DROPPED = registry.counter(
+    "log_records_dropped_total",
+    "Log records not written: sampled out, rate limited or the writer queue was full.",
+    ("reason",),
+)
+USER_SESSIONS_CREATED = registry.counter(
+    "user_sessions_created_total",
+    "User sessions created (rate() gives the session creation rate).",
+)
+
+
+def track_engine_pool(engine) -> None:
+    """Report the engine pool's checked out / overflow connections on every snapshot"""
+
+    def collect() -> None:
+        pool = engine.pool
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    registry.add_collector(collect)
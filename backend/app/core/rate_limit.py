@@ -0,0 +1,227 @@
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _take(
+    tokens: float, updated_at: float, now: float, capacity: float, rate: float
+) -> tuple[float, float]:
+    """Refill a bucket up to ``now`` and take one token: (tokens left, seconds to wait; 0 = allowed)"""
+    tokens = min(capacity, tokens + max(now - updated_at, 0.0) * rate)
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    return tokens, (1.0 - tokens) / rate
+
+
+def _refund(tokens: float, updated_at: float, now: float, capacity: float, rate: float) -> float:
+    """Refill a bucket up to ``now`` and give back one token, never above ``capacity``"""
+    return min(capacity, tokens + max(now - updated_at, 0.0) * rate + 1.0)
+
+
+class TokenBucketBackend(Protocol):
+    def acquire(self, key: str, capacity: float, rate: float) -> float:
+        """Take one token from ``key``'s bucket; 0 when allowed, else seconds until one is available"""
+        ...
+
+    def refund(self, key: str, capacity: float, rate: float) -> None:
+        """Give back a token taken by ``acquire``"""
+        ...
+
+
+class LocalTokenBucketBackend:
+    """Buckets in this process only (each uvicorn worker has its own), LRU-bounded"""
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: str, capacity: float, rate: float) -> float:
+        now = time.time()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens, wait = _take(tokens, updated_at, now, capacity, rate)
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def refund(self, key: str, capacity: float, rate: float) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is not None:  # evicted: the key gets a full bucket anyway
+            now = time.time()
+            self._buckets[key] = (_refund(*bucket, now, capacity, rate), now)
+
+
+class SharedTokenBucketBackend:
+    """
+    Buckets shared by every worker on the host through a memory-mapped file.
+
+    The file is a fixed table of ``slots`` (key hash, tokens, updated_at)
+    entries with linear probing over ``PROBES`` slots; when all of them are
+    taken the least recently updated one is reused, which at worst hands that
+    key a fresh (full) bucket. Every acquire holds an exclusive ``flock`` for a
+    few microseconds, which serializes workers without any server process.
+    """
+
+    SLOT = struct.Struct("<Qdd")
+    PROBES = 8
+
+    def __init__(self, path: str, slots: int = 65_536):
+        import fcntl  # Unix only, like the shared memory itself
+
+        self._fcntl = fcntl
+        self.path = path
+        self.slots = slots
+        size = slots * self.SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size != size:
+                os.ftruncate(self._fd, size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        value = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        return value or 1  # 0 marks an empty slot
+
+    def acquire(self, key: str, capacity: float, rate: float) -> float:
+        return self._update(key, capacity, rate, refund=False)
+
+    def refund(self, key: str, capacity: float, rate: float) -> None:
+        self._update(key, capacity, rate, refund=True)
+
+    def _update(self, key: str, capacity: float, rate: float, refund: bool) -> float:
+        key_hash = self._hash(key)
+        start = key_hash % self.slots
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+        try:
+            now = time.time()
+            target, oldest, oldest_at, found = None, None, math.inf, False
+            tokens, updated_at = capacity, now
+            for i in range(self.PROBES):
+                offset = ((start + i) % self.slots) * self.SLOT.size
+                slot_hash, slot_tokens, slot_updated_at = self.SLOT.unpack_from(self._map, offset)
+                if slot_hash == key_hash:
+                    target, tokens, updated_at = offset, slot_tokens, slot_updated_at
+                    found = True
+                    break
+                if slot_hash == 0:
+                    target = offset
+                    break
+                if slot_updated_at < oldest_at:
+                    oldest, oldest_at = offset, slot_updated_at
+            if refund:
+                if not found:
+                    return 0.0  # slot reused by another key: it gets a full bucket anyway
+                tokens, wait = _refund(tokens, updated_at, now, capacity, rate), 0.0
+            else:
+                if target is None:
+                    target = oldest
+                tokens, wait = _take(tokens, updated_at, now, capacity, rate)
+            self.SLOT.pack_into(self._map, target, key_hash, tokens, now)
+            return wait
+        finally:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+
+def reset_shared_buckets(path: str) -> None:
+    """Drop the buckets of a previous server run. Call once, before workers start."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class LoginRateLimiter:
+    """
+    Token buckets per client IP and per username in front of the password
+    check: a rejected attempt never reaches the user lookup or bcrypt, so a
+    credential-stuffing burst costs a dictionary / mmap access per request
+    instead of a core for ~200 ms.
+
+    Every attempt takes a token from both buckets before hashing, so
+    concurrent attempts against one account (e.g. from many IPs) cannot all
+    get through; a successful login gives its username token back
+    (``record_success``), so only failures count against an account.
+    """
+
+    def __init__(
+        self,
+        backend: TokenBucketBackend,
+        username_burst: float = 5,
+        username_per_minute: float = 5,
+        ip_burst: float = 20,
+        ip_per_minute: float = 60,
+    ):
+        self.backend = backend
+        self.username_limit = (username_burst, username_per_minute / 60)
+        self.ip_limit = (ip_burst, ip_per_minute / 60)
+        self.allowed = 0
+        self.rejected = {"ip": 0, "username": 0}
+
+    def check(self, username: str, ip_address: Optional[str]) -> tuple[Optional[str], float]:
+        """(None, 0) when allowed, else (the exhausted key kind, seconds to wait)"""
+        if ip_address:
+            wait = self.backend.acquire(f"ip:{ip_address}", *self.ip_limit)
+            if wait:
+                self.rejected["ip"] += 1
+                return "ip", wait
+        wait = self.backend.acquire(self._username_key(username), *self.username_limit)
+        if wait:
+            self.rejected["username"] += 1
+            return "username", wait
+        self.allowed += 1
+        return None, 0.0
+
+    def record_success(self, username: str) -> None:
+        """Give back the username token ``check`` took: only failures count"""
+        self.backend.refund(self._username_key(username), *self.username_limit)
+
+    @staticmethod
+    def _username_key(username: str) -> str:
+        # case-folded so "Admin" and "admin" share one budget
+        return f"user:{username.casefold()}"
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "username_burst": self.username_limit[0],
+            "username_per_minute": self.username_limit[1] * 60,
+            "ip_burst": self.ip_limit[0],
+            "ip_per_minute": self.ip_limit[1] * 60,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+def _create_backend() -> TokenBucketBackend:
+    if settings.LOGIN_RATE_LIMIT_FILE:
+        try:
+            return SharedTokenBucketBackend(
+                settings.LOGIN_RATE_LIMIT_FILE, slots=settings.LOGIN_RATE_LIMIT_SLOTS
+            )
+        except (ImportError, OSError) as e:
+            logger.warning("Shared login rate limit unavailable, limiting per worker: %s", e)
+    return LocalTokenBucketBackend()
+
+
+login_rate_limiter = LoginRateLimiter(
+    _create_backend(),
+    username_burst=settings.LOGIN_RATE_LIMIT_USERNAME_BURST,
+    username_per_minute=settings.LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE,
+    ip_burst=settings.LOGIN_RATE_LIMIT_IP_BURST,
+    ip_per_minute=settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+)
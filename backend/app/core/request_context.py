@@ -0,0 +1,52 @@
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Id of the HTTP request being served, set for the whole request (and the
+# tasks it spawns) so every log record written meanwhile can carry it
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# A caller-supplied id (e.g. from a proxy) is reused only if it is short and
+# safe to echo back and to log; anything else gets a fresh one
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._\-]{1,64}")
+
+
+class RequestIdMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.fullmatch(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+def setup_request_id(app):
+    app.add_middleware(RequestIdMiddleware)
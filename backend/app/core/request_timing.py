@@ -0,0 +1,112 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database.query_stats import QueryStats, track_queries
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+
+logger = logging.getLogger(__name__)
+
+
+def _server_timing(stats: QueryStats, total_seconds: float) -> str:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f"pool;dur={stats.pool_wait_seconds * 1000:.1f}, "
+        f"app;dur={total_seconds * 1000:.1f}"
+    )
+
+
+class QueryAccountingMiddleware:
+    """
+    Accounts the database work of each HTTP request (statement count, DB time
+    and pool wait), reports it in a ``Server-Timing`` header and warns when a
+    statement runs more than ``n_plus_one_threshold`` times in one request.
+
+    The header goes out with the response start, so for streamed responses it
+    only covers the work done before the first byte.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True, n_plus_one_threshold: int = 10):
+        self.app = app
+        self.server_timing = server_timing
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start" and self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", _server_timing(stats, time.perf_counter() - start))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if self.n_plus_one_threshold:
+                    self._warn_repeated(scope, stats)
+
+    def _warn_repeated(self, scope: Scope, stats: QueryStats) -> None:
+        route = scope.get("route")
+        path = getattr(route, "path", scope["path"])
+        for fingerprint, count in stats.repeated(self.n_plus_one_threshold):
+            logger.warning(
+                "Possible N+1 on %s %s: %d executions of %s",
+                scope["method"],
+                path,
+                count,
+                fingerprint,
+            )
+
+
+class RequestMetricsMiddleware:
+    """
+    Request latency histogram per route template (not raw path, to bound the
+    label set) and in-flight request gauge.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec(method=method)
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start, method=method, route=route, status=status_code
+            )
+
+
+def setup_request_timing(app):
+    if settings.METRICS_ENABLED:
+        app.add_middleware(RequestMetricsMiddleware)
+    app.add_middleware(
+        QueryAccountingMiddleware,
+        server_timing=settings.SERVER_TIMING_ENABLED,
+        n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+    )
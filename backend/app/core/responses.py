@@ -0,0 +1,25 @@
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Compact UTF-8 JSON, byte-for-byte what a ``response_model`` would produce
+    for dicts of plain values, datetimes (UTC as ``Z``) and enums.
+    """
+    return pydantic_core.to_json(content)
+
+
+class TrustedJSONResponse(JSONResponse):
+    """
+    Response for payloads built from trusted data (database rows) that skips
+    the ``response_model`` round trip: returning a Response from a route
+    bypasses FastAPI's validation and ``jsonable_encoder``, and the body is
+    encoded by ``dumps`` instead of stdlib ``json``. The route's
+    ``response_model`` still documents the shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
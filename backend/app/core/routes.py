@@ -1,13 +1,17 @@
 from fastapi import FastAPI
 from app.core.config import settings  
 from app.routers.api_test import (test) 
-from app.routers import ( users, auth )
+from app.routers import ( users, auth, admin, metrics, health )
 
 
 def register_routes(app: FastAPI):
     
     app.include_router(users.router, tags=["Users 💁🏻‍♂️"], prefix="/users")
     app.include_router(auth.router, tags=["Auth 🔑"], prefix="/auth")
+    app.include_router(admin.router, tags=["Admin 🛠️"], prefix="/admin")
+    app.include_router(health.router, tags=["Health 🩺"])
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics.router, tags=["Metrics 📈"])
 
     if not settings.enable_api_test_routes:
         return  
@@ -1,8 +1,7 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
-from jwt import DecodeError, ExpiredSignatureError, decode, encode
-import bcrypt
+from jwt import DecodeError, ExpiredSignatureError, InvalidTokenError, decode, encode
 
 from zoneinfo import ZoneInfo
 from datetime import datetime, timedelta
@@ -11,10 +10,15 @@ from app.core.database.db import async_get_db_session
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
-from sqlalchemy import select
+from app.repositories.statements import USER_BY_USERNAME
 
 from app.schemas.token import TokenData
+from app.schemas.user import UserRoleEnum, UserPrincipal
+from app.exceptions.messages import Except
 from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.cache import user_cache, token_cache
+from app.core.metrics import JWT_DECODE_FAILURES
 from typing import Annotated
 
 
@@ -47,6 +51,27 @@ def create_refresh_token(data: dict):
     return encoded_jwt
 
 
+def decode_token(token: str, refresh: bool = False) -> dict:
+    """
+    Decode and verify a JWT, memoizing the verified claims until the token expires.
+    Raises the same ``DecodeError``/``ExpiredSignatureError`` as ``jwt.decode``.
+    """
+    kind = "refresh" if refresh else "access"
+    payload = token_cache.get(kind, token)
+    if payload is not None:
+        return payload
+
+    secret = settings.SECRET_KEY_HASH_REFRESH if refresh else settings.SECRET_KEY_HASH
+    try:
+        payload = decode(token, secret, algorithms=[settings.ALGORITHM])
+    except InvalidTokenError as e:
+        reason = "expired" if isinstance(e, ExpiredSignatureError) else "invalid"
+        JWT_DECODE_FAILURES.inc(token=kind, reason=reason)
+        raise
+    token_cache.put(kind, token, payload)
+    return payload
+
+
 async def check_refresh_token(token: Token, db: db_session):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -55,9 +80,7 @@ async def check_refresh_token(token: Token, db: db_session):
     )
 
     try:
-        payload = decode(
-            token, settings.SECRET_KEY_HASH_REFRESH, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token, refresh=True)
         username: str = payload.get("sub")
         if not username:
             raise credentials_exception
@@ -69,7 +92,7 @@ async def check_refresh_token(token: Token, db: db_session):
     except ExpiredSignatureError:
         raise credentials_exception
 
-    user = await db.scalar(select(User).where(User.username == token_data.username))
+    user = await db.scalar(USER_BY_USERNAME, {"username": token_data.username})
 
     if user is None:
         raise credentials_exception
@@ -77,22 +100,27 @@ async def check_refresh_token(token: Token, db: db_session):
     return user
 
 
-def get_password_hash(password: str) -> str:
-    hashed_bytes = bcrypt.hashpw(
-        password.encode('utf-8'),
-        bcrypt.gensalt()
-    )
-    return hashed_bytes.decode('utf-8')
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    try:
-        return bcrypt.checkpw(
-            plain_password.encode('utf-8'),
-            hashed_password.encode('utf-8')
-        )
-    except Exception:
-        return False
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def get_user_principal(db: AsyncSession, username: str) -> UserPrincipal | None:
+    """Resolve a username to a principal, served from the in-process cache when fresh."""
+    principal = user_cache.get(username)
+    if principal is not None:
+        return principal
+
+    user = await db.scalar(USER_BY_USERNAME, {"username": username})
+    if user is None:
+        return None
+
+    principal = UserPrincipal.model_validate(user)
+    user_cache.put(principal)
+    return principal
 
 
 async def get_current_user(token: Token, db: db_session):
@@ -103,9 +131,7 @@ async def get_current_user(token: Token, db: db_session):
     )
 
     try:
-        payload = decode(
-            token, settings.SECRET_KEY_HASH, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         user_id: str = payload.get("sub")
         if not user_id:
             raise credentials_exception
@@ -117,7 +143,7 @@ async def get_current_user(token: Token, db: db_session):
     except ExpiredSignatureError:
         raise credentials_exception
 
-    user = await db.scalar(select(User).where(User.username == token_data.username))
+    user = await get_user_principal(db, token_data.username)
 
     if user is None:
         raise credentials_exception
@@ -126,9 +152,7 @@ async def get_current_user(token: Token, db: db_session):
 
 async def get_current_user_ws(token: str, db: db_session):
     try: 
-        payload = decode(
-            token, settings.SECRET_KEY_HASH, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         user_id: str = payload.get("sub")
         if not user_id:
             raise HTTPException(
@@ -149,7 +173,7 @@ async def get_current_user_ws(token: str, db: db_session):
             detail="Token expirado"
         )
 
-    user = await db.scalar(select(User).where(User.username == token_data.username))
+    user = await get_user_principal(db, token_data.username)
 
     if user is None:
         raise HTTPException(
@@ -159,3 +183,11 @@ async def get_current_user_ws(token: str, db: db_session):
 
     return user
 
+
+async def get_current_admin(user: Annotated[User, Depends(get_current_user)]):
+    if user.role != UserRoleEnum.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=Except.not_allowed_403(),
+        )
+    return user
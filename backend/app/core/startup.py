@@ -0,0 +1,64 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from app.core.metrics import STARTUP_PHASE_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimings:
+    """
+    Wall-clock time of each startup phase of this worker, plus whether it
+    finished. Phases are logged in one line at the end, observed in the
+    ``startup_phase_duration_seconds`` histogram (one sample per worker start,
+    so cold-start latency can be compared across deploys) and reported by
+    ``/health/ready``.
+    """
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.started_at: Optional[float] = None
+        self.total: Optional[float] = None
+        self.ready = False
+        self.error: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = round(elapsed, 4)
+            STARTUP_PHASE_DURATION.observe(elapsed, phase=name)
+
+    def fail(self, error: BaseException) -> None:
+        # class name only: stats() is served unauthenticated by /health/ready,
+        # the full error is logged by whoever caught it
+        self.error = type(error).__name__
+
+    def finish(self) -> None:
+        self.total = round(time.perf_counter() - (self.started_at or time.perf_counter()), 4)
+        STARTUP_PHASE_DURATION.observe(self.total, phase="total")
+        self.ready = self.error is None
+        logger.info(
+            "Startup %s in %.3fs (%s).",
+            "finished" if self.ready else "FAILED",
+            self.total,
+            ", ".join(f"{name}={seconds:.3f}s" for name, seconds in self.phases.items()),
+        )
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "error": self.error,
+            "total_seconds": self.total,
+            "phases": self.phases,
+        }
+
+
+startup_timings = StartupTimings()
@@ -1,7 +1,7 @@
 from fastapi import Request
 from loguru import logger
 from fastapi.responses import JSONResponse
-from typing import Callable
+from typing import Callable, Optional
 
 
 class HandlerException(Exception):
@@ -18,8 +18,14 @@ class UsernameAlreadyExists(HandlerException):
     pass
 
 
+class HashingPoolSaturated(HandlerException):
+    """raise when the password hashing pool queue is full"""
+
+    pass
+
+
 def create_exception_handler(
-    status_code: int, initial_detail: str
+    status_code: int, initial_detail: str, headers: Optional[dict[str, str]] = None
 ) -> Callable[[Request, HandlerException], JSONResponse]:
     detail = {"message": initial_detail}
 
@@ -29,7 +35,7 @@ def create_exception_handler(
 
             logger.error(exc)
             return JSONResponse(
-                status_code=status_code, content={"detail": detail["message"]}
+                status_code=status_code, content={"detail": detail["message"]}, headers=headers
             )
 
     return exception_handler
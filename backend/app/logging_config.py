@@ -1,20 +1,267 @@
 import logging
+import os
+import random
 import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
 from loguru import logger
 
+from app.core.config import settings
+from app.core.metrics import LOG_RECORDS_DROPPED
+from app.core.request_context import request_id_var
+from app.core.responses import dumps
+
 
 class InterceptHandler(logging.Handler):
-    def __init__(self):
+    """Development output: stdlib records to loguru's colorized stderr sink, written synchronously"""
+
+    def __init__(self, stream=sys.stderr, level: str = "INFO"):
         super().__init__()
         logger.remove()
         logger.add(
-            sys.stderr,
-            level="INFO",
+            stream,
+            level=level,
             colorize=True,
             format="<green>INFO:</green>     [<cyan>{time:HH:mm:ss}</cyan>] <level>- {message}</level>",
         )
+        # logger.opt() builds a new logger per call: keep the common one
+        self._log = logger.opt(depth=6).log
 
     def emit(self, record):
-        if not record.name.startswith("sqlalchemy.engine"):
-            logger_opt = logger.opt(depth=6, exception=record.exc_info)
-            logger_opt.log(record.levelname, record.getMessage())
+        if record.exc_info:
+            logger.opt(depth=6, exception=record.exc_info).log(record.levelname, record.getMessage())
+        else:
+            self._log(record.levelname, record.getMessage())
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Per-logger sampling and rate limits, configured by logger name (a rule
+    also covers the logger's children; the most specific one wins).
+
+    ``sample_rates``: fraction of records below WARNING that are kept.
+    ``rate_limits``: records per second (burst of one second's worth) across
+    all levels. The first record let through after a limited stretch carries
+    ``suppressed``, the number of records dropped meanwhile.
+    """
+
+    def __init__(self, sample_rates: dict[str, float], rate_limits: dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+        self.rate_limits = rate_limits
+        # resolved (sample rate, rate limit key) per logger name
+        self._rules: dict[str, tuple[float, Optional[str]]] = {}
+        # [tokens, updated_at, suppressed] per rate limit key
+        self._buckets = {key: [float(limit), time.monotonic(), 0] for key, limit in rate_limits.items()}
+        self.sampled_out = 0
+        self.rate_limited = 0
+
+    @staticmethod
+    def _most_specific(name: str, rules: dict) -> Optional[str]:
+        while name:
+            if name in rules:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def _resolve(self, name: str) -> tuple[float, Optional[str]]:
+        sampled = self._most_specific(name, self.sample_rates)
+        rule = (
+            self.sample_rates[sampled] if sampled is not None else 1.0,
+            self._most_specific(name, self.rate_limits),
+        )
+        self._rules[name] = rule
+        return rule
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rule = self._rules.get(record.name) or self._resolve(record.name)
+        sample_rate, limit_key = rule
+        if sample_rate < 1.0 and record.levelno < logging.WARNING and random.random() >= sample_rate:
+            self.sampled_out += 1
+            LOG_RECORDS_DROPPED.inc(reason="sampled")
+            return False
+        if limit_key is not None:
+            limit = self.rate_limits[limit_key]
+            bucket = self._buckets[limit_key]
+            now = time.monotonic()
+            bucket[0] = min(limit, bucket[0] + (now - bucket[1]) * limit)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                self.rate_limited += 1
+                LOG_RECORDS_DROPPED.inc(reason="rate_limited")
+                return False
+            bucket[0] -= 1.0
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "sample_rates": self.sample_rates,
+            "rate_limits": self.rate_limits,
+            "sampled_out": self.sampled_out,
+            "rate_limited": self.rate_limited,
+        }
+
+
+_formatter = logging.Formatter()
+
+
+class JsonQueueHandler(logging.Handler):
+    """
+    Production output: one JSON object per line, written by a background
+    thread. The calling thread (usually the event loop) only renders the
+    message and appends a tuple to a deque (no lock, no wake-up); the writer
+    polls it every ``poll_interval`` seconds and encodes and writes in
+    batches. The deque is bounded: when the writer falls behind, new records
+    are dropped and counted instead of growing memory or blocking the caller.
+    """
+
+    # small batches: the writer releases the GIL on every write, so encoding
+    # never holds it for long against the event loop
+    BATCH = 64
+
+    def __init__(self, stream=None, maxsize: int = 10_000, poll_interval: float = 0.005):
+        super().__init__()
+        stream = stream if stream is not None else sys.stderr
+        self._stream = getattr(stream, "buffer", stream)  # bytes out
+        self._records: deque = deque()
+        self.maxsize = maxsize
+        self.poll_interval = poll_interval
+        self._pid = os.getpid()
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def handle(self, record: logging.LogRecord):
+        # deque.append is atomic: no handler lock around emit
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if len(self._records) >= self.maxsize:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc(reason="queue_full")
+            return
+        try:
+            self._records.append(
+                (
+                    record.created,
+                    record.levelname,
+                    record.name,
+                    record.getMessage(),
+                    request_id_var.get(),
+                    _formatter.formatException(record.exc_info) if record.exc_info else None,
+                    getattr(record, "suppressed", 0),
+                )
+            )
+        except Exception:
+            self.handleError(record)
+
+    def _encode(self, entry: tuple) -> bytes:
+        created, level, name, message, request_id, exception, suppressed = entry
+        data = {
+            "time": datetime.fromtimestamp(created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": level,
+            "logger": name,
+            "message": message,
+            "pid": self._pid,
+        }
+        if request_id is not None:
+            data["request_id"] = request_id
+        if exception is not None:
+            data["exception"] = exception
+        if suppressed:
+            data["suppressed"] = suppressed
+        return dumps(data) + b"\n"
+
+    def _write_batch(self) -> bool:
+        records, popleft = self._records, self._records.popleft
+        batch = [popleft() for _ in range(min(len(records), self.BATCH))]
+        if not batch:
+            return False
+        try:
+            self._stream.write(b"".join(self._encode(entry) for entry in batch))
+            self._stream.flush()
+            self.written += len(batch)
+        except Exception:
+            self.write_errors += 1
+        return True
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            if not self._write_batch():
+                self._stopping.wait(self.poll_interval)
+        while self._write_batch():
+            pass
+
+    def close(self) -> None:
+        """Write what is queued (called by logging.shutdown at exit)"""
+        self._stopping.set()
+        self._thread.join(timeout=5.0)
+        super().close()
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._records),
+            "max_queued": self.maxsize,
+            "written": self.written,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+        }
+
+
+_handler: Optional[logging.Handler] = None
+_sampling: Optional[SamplingFilter] = None
+
+
+def setup_logging() -> None:
+    """Install the root handler for LOG_FORMAT once per process"""
+    global _handler, _sampling
+    if _handler is not None:
+        return
+    if settings.LOG_FORMAT == "json":
+        _handler = JsonQueueHandler(maxsize=settings.LOG_QUEUE_SIZE)
+        # code logging through loguru directly (e.g. the exception handlers)
+        # goes to the same queue instead of loguru's default text sink; a
+        # callable format keeps loguru from appending the traceback to the
+        # message (the handler gets it as exc_info)
+        logger.remove()
+        logger.add(_handler, level=settings.LOG_LEVEL, format=lambda _: "{message}")
+        # uvicorn's own handlers write plain text: send its records through ours
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            logging.getLogger(name).handlers.clear()
+            logging.getLogger(name).propagate = True
+    else:
+        _handler = InterceptHandler(level=settings.LOG_LEVEL)
+    if settings.LOG_SAMPLE_RATES or settings.LOG_RATE_LIMITS:
+        _sampling = SamplingFilter(settings.LOG_SAMPLE_RATES, settings.LOG_RATE_LIMITS)
+        _handler.addFilter(_sampling)
+    # SQL is logged by SQLObserver; keep sqlalchemy.engine out of the handler
+    # once here instead of checking every record's name
+    sqlalchemy_engine = logging.getLogger("sqlalchemy.engine")
+    sqlalchemy_engine.addHandler(logging.NullHandler())
+    sqlalchemy_engine.propagate = False
+    logging.basicConfig(handlers=[_handler], level=settings.LOG_LEVEL)
+
+
+def logging_stats() -> dict:
+    stats = {"format": settings.LOG_FORMAT, "level": settings.LOG_LEVEL}
+    if isinstance(_handler, JsonQueueHandler):
+        stats["writer"] = _handler.stats()
+    if _sampling is not None:
+        stats["sampling"] = _sampling.stats()
+    return stats
@@ -1,18 +1,98 @@
+import asyncio
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI, status
 from fastapi.responses import JSONResponse
 from app.core.config import settings
+from app.core.admission import setup_admission_control
 from app.core.cors import setup_cors
+from app.core.drain import request_drain, setup_request_drain
+from app.core.request_context import setup_request_id
+from app.core.request_timing import setup_request_timing
 from app.core.routes import register_routes
 from app.backend_pre_start import async_main
+from app.core.hashing import password_hasher
+from app.core.database.db import (
+    async_engine,
+    dispose_engines,
+    local_session,
+    replica_engine,
+    replica_monitor,
+)
+from app.core.database.warmup import warm_up_pool
+from app.core.invalidation import invalidation_listener
+from app.core.metrics import registry as metrics_registry, reset_multiprocess_directory
+from app.core.rate_limit import reset_shared_buckets
+from app.core.startup import startup_timings
+from app.services.session_activity import session_activity_buffer
+from app.services.session_reaper import session_reaper
+from app.services.stats_snapshot import stats_snapshot
 from app.exceptions.exceptions import (
     UsernameAlreadyExists,
+    HashingPoolSaturated,
     create_exception_handler,
 )
 
-app = FastAPI(default_response_class=JSONResponse)
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_engines() -> None:
+    connections = min(settings.DB_POOL_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE)
+    if connections <= 0 or startup_timings.error is not None:
+        return
+    engines = {"primary": async_engine, "replica": replica_engine}
+    for name, engine in engines.items():
+        if engine is not None:
+            warmed = await warm_up_pool(
+                engine, local_session, connections, timeout=settings.DB_POOL_WARMUP_TIMEOUT_SECONDS
+            )
+            logger.info("Pool warm-up (%s): %s.", name, warmed)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await async_main()
+    with startup_timings.phase("pool_warmup"):
+        await warm_up_engines()
+    with startup_timings.phase("background_tasks"):
+        session_activity_buffer.start()
+        if settings.SESSION_REAPER_ENABLED:
+            session_reaper.start()
+        stats_snapshot.start()
+        metrics_registry.start()
+        replica_monitor.start()
+        if settings.CACHE_INVALIDATION_ENABLED:
+            invalidation_listener.start()
+    startup_timings.finish()
+
+    yield
+
+    # uvicorn has stopped accepting connections; let running requests finish
+    # (they may still queue session activity), then stop the background tasks,
+    # flushing what they buffered, and only then close the pools
+    await request_drain.wait(settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+    await invalidation_listener.stop()
+    await replica_monitor.stop()
+    await stats_snapshot.stop()
+    await session_reaper.stop()
+    await session_activity_buffer.stop()
+    # waits for in-flight hashes: off the loop, like the hashes themselves
+    await asyncio.to_thread(password_hasher.shutdown)
+    await metrics_registry.stop()
+    await dispose_engines()
+    logger.info("Shutdown complete, database pools closed.")
+
+
+app = FastAPI(default_response_class=JSONResponse, lifespan=lifespan)
 
+setup_admission_control(app)
 setup_cors(app)
+setup_request_timing(app)
+setup_request_drain(app)
+setup_request_id(app)
 register_routes(app)
 
 @app.get("/", tags=["Root 🌱"])
@@ -27,12 +107,6 @@ def read_root():
 
     return response
 
-async def startup_event():
-    await async_main()
-
-
-app.add_event_handler("startup", startup_event)
-
 app.add_exception_handler(
     exc_class_or_status_code=UsernameAlreadyExists,
     handler=create_exception_handler(
@@ -41,11 +115,43 @@ app.add_exception_handler(
     ),
 )
 
+app.add_exception_handler(
+    exc_class_or_status_code=HashingPoolSaturated,
+    handler=create_exception_handler(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        initial_detail="Service is temporarily overloaded.",
+        # same back-off hint as the admission control 503
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    ),
+)
+
 def start():
+    if settings.METRICS_ENABLED:
+        # one directory shared by every worker; workers inherit it from the env
+        metrics_dir = settings.METRICS_DIR or os.path.join(
+            tempfile.gettempdir(), f"mateup-metrics-{os.getpid()}"
+        )
+        os.environ["METRICS_DIR"] = metrics_dir
+        reset_multiprocess_directory(metrics_dir)
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        # same for the login token buckets
+        buckets_file = settings.LOGIN_RATE_LIMIT_FILE or os.path.join(
+            tempfile.gettempdir(), f"mateup-login-buckets-{os.getpid()}.bin"
+        )
+        os.environ["LOGIN_RATE_LIMIT_FILE"] = buckets_file
+        reset_shared_buckets(buckets_file)
     print(f"🚀 Backend running on port {settings.be_port}")
     print(f"🌐 Frontend running on port {settings.fe_port}")
     print(f"📦 Frontend DEPLOY URL: {settings.fe_deploy_url}")
-    uvicorn.run("app.main:app", host="0.0.0.0", port=settings.be_port, reload=settings.ENVIRONMENT == "production", workers=2)
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=settings.be_port,
+        reload=settings.ENVIRONMENT == "production",
+        workers=2,
+        # in-flight requests get this long before connections are closed
+        timeout_graceful_shutdown=settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS,
+    )
 
 if __name__ == "__main__":
     start()
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import func, Enum
+from sqlalchemy import func, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database.db import Base
@@ -10,6 +10,13 @@ from app.schemas.user import UserRoleEnum
 
 class User(Base):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # recent logins in stats and last_login filters on listings
+        Index("ix_users_last_login", "last_login"),
+        # keyset pagination ordered by (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     username: Mapped[str] = mapped_column(unique=True)
     password: Mapped[str]
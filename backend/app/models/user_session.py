@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database.db import Base
@@ -7,6 +7,34 @@ from app.core.database.db import Base
 
 class UserSession(Base):
     __tablename__ = "user_sessions"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # FK lookups and cascades from users
+        Index("ix_user_sessions_user_id", "user_id"),
+        # active sessions of a user: logout, revocation, get_user_active_sessions
+        Index(
+            "ix_user_sessions_active_user_id_expires_at",
+            "user_id",
+            "expires_at",
+            postgresql_where=text("is_active"),
+        ),
+        # active session counts in stats
+        Index(
+            "ix_user_sessions_active_expires_at",
+            "expires_at",
+            postgresql_where=text("is_active"),
+        ),
+        # reaper: expired sessions
+        Index("ix_user_sessions_expires_at", "expires_at"),
+        # reaper: sessions logged out past retention
+        Index(
+            "ix_user_sessions_inactive_logout_at",
+            "logout_at",
+            postgresql_where=text("NOT is_active"),
+        ),
+        # daily stats, exports and revocation by login age
+        Index("ix_user_sessions_login_at", "login_at"),
+    )
     
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
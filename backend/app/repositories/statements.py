@@ -0,0 +1,37 @@
+"""
+Pre-built statements for the hot lookups (every login, refresh, logout and
+authenticated request runs one of them).
+
+Built once at import with bind parameters instead of a new ``select()`` per
+call: the construct and its cache key are reused, so each execution goes
+straight to the engine's compiled cache, and the identical SQL text hits the
+connection's prepared statement cache.
+
+    await session.scalar(USER_BY_USERNAME, {"username": username})
+"""
+from sqlalchemy import bindparam, select
+
+from app.models.user import User
+from app.models.user_session import UserSession
+
+USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
+# ETag validator of a user, read by primary key
+USER_VERSION_BY_ID = select(User.update_at).where(User.id == bindparam("user_id"))
+
+SESSION_BY_TOKEN = select(UserSession).where(
+    UserSession.session_token == bindparam("session_token")
+)
+
+# "now" is bound by the caller (datetime.now(timezone.utc)), as before
+ACTIVE_SESSION_BY_TOKEN = select(UserSession).where(
+    UserSession.session_token == bindparam("session_token"),
+    UserSession.is_active == True,
+    UserSession.expires_at > bindparam("now"),
+)
+
+ACTIVE_SESSION_BY_REFRESH_TOKEN = select(UserSession).where(
+    UserSession.refresh_token == bindparam("refresh_token"),
+    UserSession.is_active == True,
+    UserSession.expires_at > bindparam("now"),
+)
@@ -1,10 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func, and_, or_
+from sqlalchemy import select, delete, update, values, column, and_, or_, Integer, Select
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
+from app.core.invalidation import CacheEvent, publish
 from app.models.user_session import UserSession
 from app.models.user import User
+from app.repositories.statements import (
+    ACTIVE_SESSION_BY_REFRESH_TOKEN,
+    ACTIVE_SESSION_BY_TOKEN,
+    SESSION_BY_TOKEN,
+)
 
 
 class UserSessionRepository:
@@ -15,96 +21,184 @@ class UserSessionRepository:
         """Cria uma nova sessão de usuário"""
         user_session = UserSession(**session_data)
         self.session.add(user_session)
+        # Também grava alterações pendentes (ex.: last_login) na mesma transação;
+        # id, login_at e last_activity retornam via RETURNING
         await self.session.commit()
-        await self.session.refresh(user_session)
         return user_session
 
     async def get_session_by_token(self, session_token: str) -> Optional[UserSession]:
         """Busca sessão por token"""
-        stmt = select(UserSession).where(
-            and_(
-                UserSession.session_token == session_token,
-                UserSession.is_active == True,
-                UserSession.expires_at > datetime.now(timezone.utc)
-            )
+        result = await self.session.execute(
+            ACTIVE_SESSION_BY_TOKEN,
+            {"session_token": session_token, "now": datetime.now(timezone.utc)},
         )
-        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def get_session_by_refresh_token(self, refresh_token: str) -> Optional[UserSession]:
         """Busca sessão por refresh token"""
-        stmt = select(UserSession).where(
-            and_(
-                UserSession.refresh_token == refresh_token,
-                UserSession.is_active == True,
-                UserSession.expires_at > datetime.now(timezone.utc)
-            )
+        result = await self.session.execute(
+            ACTIVE_SESSION_BY_REFRESH_TOKEN,
+            {"refresh_token": refresh_token, "now": datetime.now(timezone.utc)},
         )
-        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def update_session_activity(self, session_id: int) -> Optional[UserSession]:
-        """Atualiza a última atividade da sessão"""
-        stmt = select(UserSession).where(UserSession.id == session_id)
+    async def bulk_update_session_activity(self, activity: dict[int, datetime]) -> int:
+        """Atualiza a última atividade de várias sessões em um único UPDATE ... FROM (VALUES ...)"""
+        if not activity:
+            return 0
+
+        activity_values = values(
+            column("id", Integer),
+            column("last_activity", UserSession.__table__.c.last_activity.type),
+            name="activity",
+        ).data(list(activity.items()))
+
+        stmt = (
+            update(UserSession)
+            .where(UserSession.id == activity_values.c.id)
+            .values(last_activity=activity_values.c.last_activity)
+            .execution_options(synchronize_session=False)
+        )
         result = await self.session.execute(stmt)
-        user_session = result.scalar_one_or_none()
-        
-        if user_session:
-            user_session.last_activity = datetime.now(timezone.utc)
-            await self.session.commit()
-            await self.session.refresh(user_session)
-        
-        return user_session
+        await self.session.commit()
+        return result.rowcount
 
     async def logout_session(self, session_token: str) -> bool:
         """Faz logout de uma sessão específica"""
-        stmt = select(UserSession).where(UserSession.session_token == session_token)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(SESSION_BY_TOKEN, {"session_token": session_token})
         user_session = result.scalar_one_or_none()
         
         if user_session:
             user_session.is_active = False
             user_session.logout_at = datetime.now(timezone.utc)
+            await publish(self.session, CacheEvent.sessions_revoked, user_ids=[user_session.user_id])
             await self.session.commit()
             return True
         
         return False
 
     async def logout_all_user_sessions(self, user_id: int) -> int:
-        """Faz logout de todas as sessões de um usuário"""
-        stmt = select(UserSession).where(
-            and_(
-                UserSession.user_id == user_id,
-                UserSession.is_active == True
+        """Faz logout de todas as sessões de um usuário em um único UPDATE ... RETURNING"""
+        stmt = (
+            update(UserSession)
+            .where(
+                and_(
+                    UserSession.user_id == user_id,
+                    UserSession.is_active == True
+                )
             )
+            .values(is_active=False, logout_at=datetime.now(timezone.utc))
+            .returning(UserSession.id)
+            .execution_options(synchronize_session=False)
         )
         result = await self.session.execute(stmt)
-        sessions = result.scalars().all()
-        
-        count = 0
-        for session in sessions:
-            session.is_active = False
-            session.logout_at = datetime.now(timezone.utc)
-            count += 1
-        
+        count = len(result.all())
+        if count:
+            await publish(self.session, CacheEvent.sessions_revoked, user_ids=[user_id])
         await self.session.commit()
         return count
 
-    async def cleanup_expired_sessions(self) -> int:
-        """Remove sessões expiradas"""
-        stmt = delete(UserSession).where(
-            or_(
-                UserSession.expires_at < datetime.now(timezone.utc),
-                and_(
-                    UserSession.is_active == False,
-                    UserSession.logout_at < datetime.now(timezone.utc) - timedelta(days=7)
+    async def revoke_sessions(
+        self,
+        user_ids: Optional[List[int]] = None,
+        device_info: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        logged_in_before: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> tuple[int, int]:
+        """
+        Revoga sessões ativas que casam com os filtros, em lotes de ``batch_size``.
+        Cada lote é uma transação curta (SKIP LOCKED), sem segurar locks por muito tempo.
+        Retorna (sessões revogadas, lotes executados).
+        """
+        filters = [UserSession.is_active == True]
+        if user_ids:
+            filters.append(UserSession.user_id.in_(user_ids))
+        if device_info is not None:
+            filters.append(UserSession.device_info == device_info)
+        if ip_address is not None:
+            filters.append(UserSession.ip_address == ip_address)
+        if logged_in_before is not None:
+            filters.append(UserSession.login_at < logged_in_before)
+
+        revoked = 0
+        batches = 0
+        while True:
+            batch_ids = (
+                select(UserSession.id)
+                .where(and_(*filters))
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            stmt = (
+                update(UserSession)
+                .where(UserSession.id.in_(batch_ids))
+                .values(is_active=False, logout_at=datetime.now(timezone.utc))
+                .returning(UserSession.id, UserSession.user_id)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.session.execute(stmt)
+            rows = result.all()
+            count = len(rows)
+            if count:
+                # publicado no commit do próprio lote
+                await publish(
+                    self.session,
+                    CacheEvent.sessions_revoked,
+                    user_ids=[user_id for _, user_id in rows],
+                )
+            await self.session.commit()
+
+            if count:
+                revoked += count
+                batches += 1
+            if count < batch_size:
+                return revoked, batches
+
+    async def delete_expired_sessions_batch(
+        self,
+        expired_before: datetime,
+        logged_out_before: datetime,
+        batch_size: int = 1000,
+    ) -> int:
+        """Remove até ``batch_size`` sessões expiradas ou encerradas antes dos limites informados"""
+        batch_ids = (
+            select(UserSession.id)
+            .where(
+                or_(
+                    UserSession.expires_at < expired_before,
+                    and_(
+                        UserSession.is_active == False,
+                        UserSession.logout_at < logged_out_before
+                    )
                 )
             )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            delete(UserSession)
+            .where(UserSession.id.in_(batch_ids))
+            .execution_options(synchronize_session=False)
         )
         result = await self.session.execute(stmt)
         await self.session.commit()
         return result.rowcount
 
+    async def cleanup_expired_sessions(self, batch_size: int = 1000) -> int:
+        """Remove sessões expiradas, em lotes para não segurar locks na tabela"""
+        now = datetime.now(timezone.utc)
+        total = 0
+        while True:
+            deleted = await self.delete_expired_sessions_batch(
+                expired_before=now,
+                logged_out_before=now - timedelta(days=7),
+                batch_size=batch_size,
+            )
+            total += deleted
+            if deleted < batch_size:
+                return total
+
     async def get_user_active_sessions(self, user_id: int) -> List[UserSession]:
         """Busca sessões ativas de um usuário"""
         stmt = select(UserSession).where(
@@ -118,63 +212,25 @@ class UserSessionRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def get_session_stats(self) -> dict:
-        """Busca estatísticas de sessões"""
-        now = datetime.now()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        active_stmt = select(func.count(UserSession.id)).where(
-            and_(
-                UserSession.is_active == True,
-                UserSession.expires_at > now
-            )
-        )
-        active_result = await self.session.execute(active_stmt)
-        active_sessions = active_result.scalar()
-
-        # Sessões criadas hoje
-        today_stmt = select(func.count(UserSession.id)).where(
-            UserSession.login_at >= today_start
-        )
-        today_result = await self.session.execute(today_stmt)
-        total_sessions_today = today_result.scalar()
-
-        # Usuários únicos que fizeram login hoje
-        unique_users_stmt = select(func.count(func.distinct(UserSession.user_id))).where(
-            UserSession.login_at >= today_start
+    @staticmethod
+    def export_sessions_query(
+        login_from: Optional[datetime] = None, login_to: Optional[datetime] = None
+    ) -> Select:
+        """Consulta de exportação de sessões (sem tokens), em ordem de id para leitura por cursor"""
+        stmt = select(
+            UserSession.id,
+            UserSession.user_id,
+            UserSession.device_info,
+            UserSession.ip_address,
+            UserSession.user_agent,
+            UserSession.login_at,
+            UserSession.last_activity,
+            UserSession.logout_at,
+            UserSession.expires_at,
+            UserSession.is_active,
         )
-        unique_users_result = await self.session.execute(unique_users_stmt)
-        unique_users_today = unique_users_result.scalar()
-
-        # Duração média das sessões (em minutos)
-        avg_duration_stmt = select(
-            func.avg(
-                func.extract('epoch', UserSession.last_activity - UserSession.login_at) / 60
-            )
-        ).where(
-            and_(
-                UserSession.logout_at.isnot(None),
-                UserSession.login_at >= today_start
-            )
-        )
-        avg_duration_result = await self.session.execute(avg_duration_stmt)
-        avg_duration = avg_duration_result.scalar() or 0
-
-        # Sessões por dispositivo (simplificado)
-        device_stmt = select(
-            func.coalesce(UserSession.device_info, 'Unknown'),
-            func.count(UserSession.id)
-        ).where(
-            UserSession.login_at >= today_start
-        ).group_by(UserSession.device_info)
-        
-        device_result = await self.session.execute(device_stmt)
-        sessions_by_device = {device or 'Unknown': count for device, count in device_result.fetchall()}
-
-        return {
-            "active_sessions": active_sessions,
-            "total_sessions_today": total_sessions_today,
-            "unique_users_today": unique_users_today,
-            "average_session_duration": round(avg_duration, 2),
-            "sessions_by_device": sessions_by_device,
-        }
+        if login_from is not None:
+            stmt = stmt.where(UserSession.login_at >= login_from)
+        if login_to is not None:
+            stmt = stmt.where(UserSession.login_at < login_to)
+        return stmt.order_by(UserSession.id)
@@ -1,79 +1,182 @@
+import json
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func
-from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, delete, inspect, text, tuple_, Row, Select
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timezone
+from typing import Optional, Sequence
 
+from app.core.database.replica import READ_REPLICA
+from app.core.invalidation import CacheEvent, publish
 from app.models.user import User
+from app.repositories.statements import USER_BY_USERNAME, USER_VERSION_BY_ID
+from app.schemas.user import UserRoleEnum
+
+# Only the columns UserDetail needs, so listings never load password hashes
+USER_DETAIL_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.role,
+    User.is_active,
+    User.created_at,
+    User.update_at,
+)
+USER_DETAIL_FIELDS = tuple(column.key for column in USER_DETAIL_COLUMNS)
 
 
 class UserRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_user_by_id(self, user_id: int) -> User:
+    async def get_user_by_id(self, user_id: int, replica: bool = False) -> User:
+        # replica=True só para leituras: quem vai alterar o usuário lê do primário
+        if replica:
+            # AsyncSession.get não aceita bind_arguments
+            result = await self.session.scalars(
+                select(User).where(User.id == user_id), bind_arguments=READ_REPLICA
+            )
+            return result.first()
         stmt = await self.session.get(User, user_id)
         return stmt
 
+    async def get_user_version(self, user_id: int) -> Optional[datetime]:
+        """update_at do usuário (validador de ETag), sem carregar a linha"""
+        return await self.session.scalar(
+            USER_VERSION_BY_ID, {"user_id": user_id}, bind_arguments=READ_REPLICA
+        )
+
     async def get_user_by_username(self, username: str) -> User:
-        stmt = select(User).where(User.username == username)
-        result = await self.session.scalars(stmt)
+        result = await self.session.scalars(USER_BY_USERNAME, {"username": username})
         return result.first()
 
     async def add_user(self, user: User) -> User:
+        # server defaults (id, created_at, update_at) come back via RETURNING
         self.session.add(user)
         await self.session.commit()
-        await self.session.refresh(user)
         return user
 
-    async def update_user(self, user: User) -> User:
+    async def update_user(
+        self, user: User, commit: bool = True, event: Optional[CacheEvent] = None
+    ) -> User:
         self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
+        if event is not None:
+            # avisa os outros workers no mesmo commit (também pelo username antigo, se mudou)
+            previous = inspect(user).attrs.username.history.deleted or ()
+            await publish(self.session, event, user_ids=[user.id], usernames=[user.username, *previous])
+        if commit:
+            await self.session.commit()
         return user
 
+    async def get_existing_usernames(self, usernames: Sequence[str]) -> set[str]:
+        """Which of ``usernames`` already exist, in one set-based query"""
+        if not usernames:
+            return set()
+        stmt = select(User.username).where(User.username.in_(usernames))
+        result = await self.session.scalars(stmt)
+        return set(result.all())
+
+    async def bulk_insert_users(self, rows: list[dict]) -> dict[str, int]:
+        """
+        Insert many users with batched multi-row INSERTs, skipping usernames
+        taken concurrently. Returns ``{username: id}`` for the rows inserted.
+        """
+        if not rows:
+            return {}
+        stmt = (
+            insert(User)
+            .on_conflict_do_nothing(index_elements=[User.username])
+            .returning(User.id, User.username)
+        )
+        result = await self.session.execute(stmt, rows)
+        inserted = {username: user_id for user_id, username in result.all()}
+        await self.session.commit()
+        return inserted
+
     async def get_all_users_repository(self) -> list[User]:
         stmt = select(User)
-        result = await self.session.scalars(stmt)
+        result = await self.session.scalars(stmt, bind_arguments=READ_REPLICA)
         return result.all()
 
+    async def get_users_page(
+        self,
+        limit: int,
+        order_by: str = "id",
+        after: Optional[tuple] = None,
+        role: Optional[UserRoleEnum] = None,
+        is_active: Optional[bool] = None,
+        last_login_from: Optional[datetime] = None,
+        last_login_to: Optional[datetime] = None,
+        include_total: bool = False,
+    ) -> tuple[Sequence[Row], Optional[int]]:
+        """
+        Keyset page of users ordered by ``id`` or ``(created_at, id)``, starting
+        after the ``after`` key. Fetches ``limit + 1`` rows so the caller can tell
+        whether another page exists. The optional total is a planner estimate.
+        """
+        stmt = select(*USER_DETAIL_COLUMNS)
+        if role is not None:
+            stmt = stmt.where(User.role == role)
+        if is_active is not None:
+            stmt = stmt.where(User.is_active == is_active)
+        if last_login_from is not None:
+            stmt = stmt.where(User.last_login >= last_login_from)
+        if last_login_to is not None:
+            stmt = stmt.where(User.last_login < last_login_to)
+
+        total = await self.estimate_count(stmt) if include_total else None
+
+        if order_by == "created_at":
+            if after is not None:
+                stmt = stmt.where(tuple_(User.created_at, User.id) > tuple_(*after))
+            stmt = stmt.order_by(User.created_at, User.id)
+        else:
+            if after is not None:
+                stmt = stmt.where(User.id > after[0])
+            stmt = stmt.order_by(User.id)
+
+        result = await self.session.execute(stmt.limit(limit + 1), bind_arguments=READ_REPLICA)
+        return result.all(), total
+
+    async def estimate_count(self, stmt: Select) -> int:
+        """Row estimate from the planner (or pg_class for the whole table), never count(*)"""
+        if stmt.whereclause is None:
+            reltuples = await self.session.scalar(
+                text("SELECT reltuples FROM pg_class WHERE oid = 'users'::regclass"),
+                bind_arguments=READ_REPLICA,
+            )
+            return max(int(reltuples or 0), 0)
+
+        compiled = stmt.compile(
+            dialect=self.session.get_bind().dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = await self.session.scalar(
+            text(f"EXPLAIN (FORMAT JSON) {compiled}"), bind_arguments=READ_REPLICA
+        )
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def export_users_query(
+        created_from: Optional[datetime] = None, created_to: Optional[datetime] = None
+    ) -> Select:
+        """Consulta de exportação (sem hash de senha), em ordem de id para leitura por cursor"""
+        stmt = select(*USER_DETAIL_COLUMNS, User.last_login)
+        if created_from is not None:
+            stmt = stmt.where(User.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(User.created_at < created_to)
+        return stmt.order_by(User.id)
+
     async def delete_user(self, user_id: int):
         user = await self.session.get(User, user_id)
         if user:
             await self.session.delete(user)
+            await publish(self.session, CacheEvent.user_deleted, user_ids=[user.id], usernames=[user.username])
             await self.session.commit()
 
-    async def get_user_stats(self) -> dict:
-        # Total
-        total_stmt = select(func.count(User.id))
-        total_result = await self.session.execute(total_stmt)
-        total_users = total_result.scalar()
-
-        # active
-        active_stmt = select(func.count(User.id)).where(User.is_active == True)
-        active_result = await self.session.execute(active_stmt)
-        active_users = active_result.scalar()
-
-        # inactive
-        inactive_users = total_users - active_users
-
-        # by role
-        role_stmt = select(User.role, func.count(User.id)).group_by(User.role)
-        role_result = await self.session.execute(role_stmt)
-        users_by_role = {role.value: count for role, count in role_result.fetchall()}
-
-        # recent logins (24h)
-        yesterday = datetime.now() - timedelta(days=1)
-        recent_stmt = select(func.count(User.id)).where(User.last_login >= yesterday)
-        recent_result = await self.session.execute(recent_stmt)
-        recent_logins = recent_result.scalar()
-
-        return {
-            "total_users": total_users,
-            "active_users": active_users,
-            "inactive_users": inactive_users,
-            "users_by_role": users_by_role,
-            "recent_logins": recent_logins,
-        }
-
-    async def update_last_login(self, user: User):
+    async def update_last_login(self, user: User, commit: bool = True):
         user.last_login = datetime.now(timezone.utc)
-        await self.update_user(user)
+        # também muda update_at (o ETag): os outros workers descartam o principal em cache
+        await self.update_user(user, commit=commit, event=CacheEvent.user_updated)
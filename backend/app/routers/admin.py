@@ -0,0 +1,259 @@
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Annotated, Literal, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import get_current_admin
+from app.core.database.db import (
+    async_engine,
+    async_get_db_session,
+    replica_monitor,
+    sql_observer,
+    statement_cache,
+)
+from app.core.hashing import password_hasher
+from app.core.admission import admission_controller
+from app.core.rate_limit import login_rate_limiter
+from app.logging_config import logging_stats
+from app.core.cache import user_cache, token_cache
+from app.core.invalidation import invalidation_listener
+from app.services.session_activity import session_activity_buffer
+from app.services.session_reaper import session_reaper
+from app.services.stats_snapshot import stats_snapshot
+from app.services.exports import export_service, ExportFormat, MEDIA_TYPES
+from app.services.user_import import UserImportService, ImportFormat
+from app.models.user import User
+from app.schemas.user import UserImportResult
+from app.schemas.user_session import SessionRevokeRequest, SessionRevokeResult
+from app.repositories.users import UserRepository
+from app.repositories.user_sessions import UserSessionRepository
+from app.services.user_sessions import UserSessionService
+
+router = APIRouter()
+
+CurrentAdmin = Annotated[User, Depends(get_current_admin)]
+db_session = Annotated[AsyncSession, Depends(async_get_db_session)]
+
+
+@router.get(
+    "/stats/hashing",
+    status_code=status.HTTP_200_OK,
+    summary="Password hashing pool metrics",
+)
+async def get_hashing_stats(current_admin: CurrentAdmin):
+    """Queue depth, rejections, pool wait time and bcrypt hash/verify time"""
+    return password_hasher.stats()
+
+
+@router.get(
+    "/stats/caches",
+    status_code=status.HTTP_200_OK,
+    summary="In-process cache metrics",
+)
+async def get_cache_stats(current_admin: CurrentAdmin):
+    """Size, hit/miss counters and evictions of this worker's caches"""
+    return {
+        "users": user_cache.stats(),
+        "tokens": token_cache.stats(),
+        "invalidation": invalidation_listener.stats(),
+    }
+
+
+@router.get(
+    "/stats/session-activity",
+    status_code=status.HTTP_200_OK,
+    summary="Session activity write-behind buffer metrics",
+)
+async def get_session_activity_stats(current_admin: CurrentAdmin):
+    """Pending timestamps and flush counters of this worker's activity buffer"""
+    return session_activity_buffer.stats()
+
+
+@router.get(
+    "/stats/session-reaper",
+    status_code=status.HTTP_200_OK,
+    summary="Session reaper progress metrics",
+)
+async def get_session_reaper_stats(current_admin: CurrentAdmin):
+    """Runs, skipped runs (another worker held the lock) and rows deleted by this worker"""
+    return session_reaper.stats()
+
+
+@router.get(
+    "/stats/sql",
+    status_code=status.HTTP_200_OK,
+    summary="Per-statement SQL timing aggregates",
+)
+async def get_sql_stats(
+    current_admin: CurrentAdmin,
+    sort: Literal["total_ms", "mean_ms", "max_ms", "count", "errors", "slow"] = "total_ms",
+    limit: int = Query(default=50, ge=1, le=500),
+):
+    """Executions, rows, errors, slow count and latency per statement fingerprint, for this worker"""
+    return sql_observer.stats(sort=sort, limit=limit)
+
+
+@router.get(
+    "/stats/statement-cache",
+    status_code=status.HTTP_200_OK,
+    summary="Compiled and prepared statement cache hit rates",
+)
+async def get_statement_cache_stats(current_admin: CurrentAdmin):
+    """SQLAlchemy compiled cache results and asyncpg prepares vs executions, for this worker"""
+    return statement_cache.stats()
+
+
+@router.get(
+    "/stats/pool",
+    status_code=status.HTTP_200_OK,
+    summary="Database connection pool metrics",
+)
+async def get_pool_stats(current_admin: CurrentAdmin):
+    """Checked out connections, overflow, checkout wait and timeouts of this worker's pool"""
+    return async_engine.pool.stats()
+
+
+@router.get(
+    "/stats/admission",
+    status_code=status.HTTP_200_OK,
+    summary="Admission control metrics",
+)
+async def get_admission_stats(current_admin: CurrentAdmin):
+    """In-flight requests, budgets and admitted/rejected counts per priority on this worker"""
+    return admission_controller.stats()
+
+
+@router.get(
+    "/stats/login-rate-limit",
+    status_code=status.HTTP_200_OK,
+    summary="Login rate limiter counters",
+)
+async def get_login_rate_limit_stats(current_admin: CurrentAdmin):
+    """Bucket limits and allowed / throttled login attempts on this worker"""
+    return login_rate_limiter.stats()
+
+
+@router.get(
+    "/stats/logging",
+    status_code=status.HTTP_200_OK,
+    summary="Log pipeline counters",
+)
+async def get_logging_stats(current_admin: CurrentAdmin):
+    """Log format, writer queue depth and records written / dropped on this worker"""
+    return logging_stats()
+
+
+@router.get(
+    "/stats/replica",
+    status_code=status.HTTP_200_OK,
+    summary="Read replica health",
+)
+async def get_replica_stats(current_admin: CurrentAdmin):
+    """Replica health, last measured lag and reads routed to it / back to the primary on this worker"""
+    return replica_monitor.stats()
+
+
+@router.delete(
+    "/stats/sql",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Reset SQL timing aggregates",
+)
+async def reset_sql_stats(current_admin: CurrentAdmin):
+    """Start a new aggregation window on this worker"""
+    sql_observer.reset()
+
+
+@router.post(
+    "/sessions/revoke",
+    response_model=SessionRevokeResult,
+    status_code=status.HTTP_200_OK,
+    summary="Revoke sessions in bulk",
+)
+async def revoke_sessions(
+    revoke_request: SessionRevokeRequest, db: db_session, current_admin: CurrentAdmin
+):
+    """Revoke active sessions by user ids, device, IP or login age, in bounded batches"""
+    session_service = UserSessionService(UserSessionRepository(db))
+    return await session_service.revoke_sessions(revoke_request)
+
+
+@router.get(
+    "/stats/snapshot",
+    status_code=status.HTTP_200_OK,
+    summary="Dashboard statistics snapshot metrics",
+)
+async def get_stats_snapshot_stats(current_admin: CurrentAdmin):
+    """Snapshot age, refresh count/duration and how many polls were coalesced"""
+    return stats_snapshot.stats()
+
+
+def _export_response(
+    request: Request, stmt, name: str, export_format: ExportFormat, gzip: bool
+) -> StreamingResponse:
+    filename = f"{name}.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_service.stream(request, stmt, export_format, compress=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/export/users",
+    status_code=status.HTTP_200_OK,
+    summary="Stream all users as NDJSON or CSV",
+)
+async def export_users(
+    request: Request,
+    current_admin: CurrentAdmin,
+    format: ExportFormat = "ndjson",
+    gzip: bool = False,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """Stream users read through a server-side cursor, optionally gzip-compressed"""
+    stmt = UserRepository.export_users_query(created_from, created_to)
+    return _export_response(request, stmt, "users", format, gzip)
+
+
+@router.get(
+    "/export/sessions",
+    status_code=status.HTTP_200_OK,
+    summary="Stream user sessions as NDJSON or CSV",
+)
+async def export_sessions(
+    request: Request,
+    current_admin: CurrentAdmin,
+    format: ExportFormat = "ndjson",
+    gzip: bool = False,
+    login_from: Optional[datetime] = None,
+    login_to: Optional[datetime] = None,
+):
+    """Stream sessions (without tokens) read through a server-side cursor"""
+    stmt = UserSessionRepository.export_sessions_query(login_from, login_to)
+    return _export_response(request, stmt, "sessions", format, gzip)
+
+
+@router.post(
+    "/users/import",
+    response_model=UserImportResult,
+    status_code=status.HTTP_200_OK,
+    summary="Bulk import users from CSV or NDJSON",
+)
+async def import_users(
+    request: Request,
+    db: db_session,
+    current_admin: CurrentAdmin,
+    format: Optional[ImportFormat] = None,
+):
+    """
+    Import a CSV (header: username,email,password[,role]) or NDJSON stream of users.
+    The format defaults to the request Content-Type. Returns a per-row report.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if "csv" in content_type else "ndjson"
+    import_service = UserImportService(UserRepository(db), batch_size=settings.IMPORT_BATCH_SIZE)
+    return await import_service.import_users(request.stream(), format)
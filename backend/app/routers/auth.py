@@ -1,3 +1,5 @@
+import math
+
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
@@ -5,6 +7,10 @@ from app.core.database.db import async_get_db_session
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.core.metrics import AUTH_LOGINS
+from app.core.rate_limit import login_rate_limiter
 from app.core.security import (
     verify_password,
     create_access_token,
@@ -31,26 +37,43 @@ async def login_for_access_token(
     db: db_session,
     request: Request
 ):
+    ip_address = request.client.host if request.client else None
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        # before the user lookup and bcrypt: throttled attempts cost no hashing
+        exhausted, retry_after = login_rate_limiter.check(form_data.username, ip_address)
+        if exhausted is not None:
+            AUTH_LOGINS.inc(result="throttled", reason=exhausted)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
     user_repo = UserRepository(db)
     session_repo = UserSessionRepository(db)
     session_service = UserSessionService(session_repo)
     
     user = await user_repo.get_user_by_username(username=form_data.username)
     if not user:
+        AUTH_LOGINS.inc(result="failure", reason="unknown_user")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="This username does not exist.",
         )
 
-    if not verify_password(form_data.password, user.password):
+    if not await verify_password(form_data.password, user.password):
+        AUTH_LOGINS.inc(result="failure", reason="bad_password")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect password."
         )
 
-    await user_repo.update_last_login(user)
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        login_rate_limiter.record_success(form_data.username)
+
+    # last_login is flushed together with the new session in a single commit
+    await user_repo.update_last_login(user, commit=False)
 
     user_agent = request.headers.get("user-agent", "")
-    ip_address = request.client.host if request.client else None
     
     session = await session_service.create_session(
         user=user,
@@ -58,9 +81,12 @@ async def login_for_access_token(
         ip_address=ip_address,
         user_agent=user_agent
     )
+    # last_login changed update_at, the /me ETag: drop the cached principal
+    user_cache.evict(username=user.username, user_id=user.id)
 
     access_token = create_access_token(data={"sub": user.username})
     refresh_token = create_refresh_token(data={"sub": user.id})
+    AUTH_LOGINS.inc(result="success", reason="")
     response = RefreshToken(
         access_token=access_token, 
         token_type="Bearer", 
@@ -0,0 +1,40 @@
+import asyncio
+import logging
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database.db import async_engine
+from app.core.startup import startup_timings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/health/live")
+async def liveness():
+    """The worker's event loop is serving requests; never touches the database"""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """Startup finished and the primary database answers within READINESS_DB_TIMEOUT_SECONDS"""
+    body = {"status": "ready", "startup": startup_timings.stats()}
+    if not startup_timings.ready:
+        body["status"] = "starting" if startup_timings.error is None else "failed"
+        return JSONResponse(body, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    try:
+        async with asyncio.timeout(settings.READINESS_DB_TIMEOUT_SECONDS):
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+    except Exception as e:
+        # unauthenticated endpoint: the message may name hosts or users, so it is only logged
+        logger.warning("Readiness check failed: %s: %s", type(e).__name__, e)
+        body["status"] = "database unavailable"
+        body["error"] = type(e).__name__
+        return JSONResponse(body, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return body
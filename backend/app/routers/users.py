@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import if_none_match, not_modified, set_validators, weak_etag
+from app.core.config import settings
+from app.core.responses import TrustedJSONResponse
 from app.core.security import get_current_user
 from app.core.database.db import async_get_db_session
 from app.models.user import User
@@ -13,6 +16,7 @@ from app.schemas.user import (
     UserList,
     UserDetail,
     UserStats,
+    UserListFilters,
 )
 from app.services.users import UserService
 from app.repositories.users import UserRepository
@@ -29,10 +33,18 @@ db_session = Annotated[AsyncSession, Depends(async_get_db_session)]
     response_model=UserDetail,
     summary="Get current user data",
 )
-async def get_current_user_data(current_user: CurrentUser, db: db_session):
-    """Get the current authenticated user's data"""
+async def get_current_user_data(
+    request: Request, response: Response, current_user: CurrentUser, db: db_session
+):
+    """Get the current authenticated user's data (304 when If-None-Match still matches)"""
     user_service = UserService(UserRepository(db))
-    return await user_service.get_user_by_id(current_user.id, current_user)
+    if "if-none-match" in request.headers:
+        etag = await user_service.get_user_etag(current_user.id, current_user)
+        if if_none_match(request, etag):
+            return not_modified(etag)
+    user = await user_service.get_user_by_id(current_user.id, current_user)
+    set_validators(response, weak_etag(user.id, user.update_at))
+    return user
 
 
 @router.post(
@@ -75,9 +87,16 @@ async def activate_or_deactivate_user(
 @router.get(
     "", response_model=UserList, status_code=status.HTTP_200_OK, summary="Get all users"
 )
-async def read_users(db: db_session, current_user: CurrentUser):
+async def read_users(
+    filters: Annotated[UserListFilters, Query()], db: db_session, current_user: CurrentUser
+):
+    """Keyset-paginated user listing; pass ``next_cursor`` back as ``cursor`` for the next page"""
     all_users = UserService(UserRepository(db))
-    return {"users": await all_users.get_all_users(current_user)}
+    page = await all_users.get_users_page(filters, current_user)
+    if settings.FAST_JSON_RESPONSES:
+        # rows come from the database: encode them without re-validating through UserList
+        return TrustedJSONResponse(UserService.users_page_payload(page))
+    return page
 
 
 @router.get(
@@ -86,9 +105,18 @@ async def read_users(db: db_session, current_user: CurrentUser):
     response_model=UserDetail,
     summary="Get user by id",
 )
-async def read_user(user_id: int, db: db_session, current_user: CurrentUser):
+async def read_user(
+    user_id: int, request: Request, response: Response, db: db_session, current_user: CurrentUser
+):
+    """Get a user (304 when If-None-Match still matches)"""
     user_to_get = UserService(UserRepository(db))
-    return await user_to_get.get_user_by_id(user_id, current_user)
+    if "if-none-match" in request.headers:
+        etag = await user_to_get.get_user_etag(user_id, current_user)
+        if if_none_match(request, etag):
+            return not_modified(etag)
+    user = await user_to_get.get_user_by_id(user_id, current_user)
+    set_validators(response, weak_etag(user.id, user.update_at))
+    return user
 
 
 @router.delete(
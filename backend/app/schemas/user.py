@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import List
+from pydantic import BaseModel, EmailStr, ConfigDict, Field
+from typing import Any, List, Literal, Optional
 from enum import Enum
 from datetime import datetime
 
@@ -39,8 +39,35 @@ class UserDetail(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPrincipal(BaseModel):
+    """Snapshot of the authenticated user, safe to share between requests."""
+
+    id: int
+    username: str
+    email: str
+    role: UserRoleEnum
+    is_active: bool
+    created_at: datetime | None = None
+    update_at: datetime | None = None
+    last_login: datetime | None = None
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 class UserList(BaseModel):
     users: List[UserDetail]
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+
+class UserListFilters(BaseModel):
+    limit: int = Field(default=100, ge=1, le=1000)
+    cursor: Optional[str] = None
+    order_by: Literal["id", "created_at"] = "id"
+    role: Optional[UserRoleEnum] = None
+    is_active: Optional[bool] = None
+    last_login_from: Optional[datetime] = None
+    last_login_to: Optional[datetime] = None
+    include_total: bool = False
 
 
 class UserStats(BaseModel):
@@ -53,3 +80,20 @@ class UserStats(BaseModel):
     total_sessions_today: int
     unique_users_today: int
     average_session_duration: float
+
+
+class UserImportRow(BaseModel):
+    row: int
+    username: Optional[str] = None
+    status: Literal["created", "duplicate", "invalid"]
+    id: Optional[int] = None
+    detail: Optional[Any] = None
+
+
+class UserImportResult(BaseModel):
+    created: int
+    duplicate: int
+    invalid: int
+    elapsed_seconds: float
+    users_per_second: float
+    rows: List[UserImportRow]
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class UserSessionCreate(BaseModel):
@@ -40,3 +40,27 @@ class SessionStats(BaseModel):
     unique_users_today: int
     average_session_duration: float  
     sessions_by_device: dict
+
+
+class SessionRevokeRequest(BaseModel):
+    user_ids: Optional[List[int]] = None
+    device_info: Optional[str] = None
+    ip_address: Optional[str] = None
+    logged_in_before: Optional[datetime] = None
+    all_sessions: bool = False
+    batch_size: int = Field(default=1000, ge=1, le=10_000)
+
+    @model_validator(mode="after")
+    def require_a_filter(self):
+        has_filter = bool(self.user_ids) or any(
+            value is not None
+            for value in (self.device_info, self.ip_address, self.logged_in_before)
+        )
+        if not has_filter and not self.all_sessions:
+            raise ValueError("Provide at least one filter or set all_sessions=true.")
+        return self
+
+
+class SessionRevokeResult(BaseModel):
+    revoked: int
+    batches: int
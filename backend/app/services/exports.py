@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+import logging
+import zlib
+from contextlib import aclosing
+from datetime import date, datetime
+from enum import Enum
+from typing import AsyncIterator, Literal
+
+from fastapi import Request
+from sqlalchemy import Select
+
+from app.core.config import settings
+from app.core.database.db import local_session
+from app.core.database.replica import READ_REPLICA
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    """
+    Streams query results as NDJSON or CSV without materializing the table.
+
+    Rows are read through a server-side cursor in partitions of ``chunk_rows``;
+    each partition is encoded (and optionally gzip-compressed) and handed to
+    the response before the next one is fetched. The export owns its database
+    session because the response body outlives the request's dependencies.
+    """
+
+    def __init__(self, session_factory=local_session, chunk_rows: int = 1000):
+        self._session_factory = session_factory
+        self.chunk_rows = chunk_rows
+
+    async def _partitions(self, stmt: Select) -> AsyncIterator[list]:
+        async with self._session_factory() as db:
+            result = await db.stream(
+                stmt.execution_options(yield_per=self.chunk_rows), bind_arguments=READ_REPLICA
+            )
+            async with aclosing(result.mappings().partitions()) as partitions:
+                async for partition in partitions:
+                    yield partition
+
+    async def _encode(self, stmt: Select, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow([column.name for column in stmt.selected_columns])
+            async with aclosing(self._partitions(stmt)) as partitions:
+                async for partition in partitions:
+                    writer.writerows([_csv_value(value) for value in row.values()] for row in partition)
+                    yield buffer.getvalue().encode("utf-8")
+                    buffer.seek(0)
+                    buffer.truncate()
+        else:
+            async with aclosing(self._partitions(stmt)) as partitions:
+                async for partition in partitions:
+                    yield "".join(
+                        json.dumps(dict(row), default=_json_default) + "\n" for row in partition
+                    ).encode("utf-8")
+
+    async def stream(
+        self,
+        request: Request,
+        stmt: Select,
+        export_format: ExportFormat = "ndjson",
+        compress: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """Encoded (and optionally gzipped) chunks; stops as soon as the client disconnects."""
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        chunks_sent = 0
+        async with aclosing(self._encode(stmt, export_format)) as chunks:
+            async for chunk in chunks:
+                if await request.is_disconnected():
+                    logger.info("Export cancelled by client after %d chunks.", chunks_sent)
+                    return
+                chunks_sent += 1
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                    if not chunk:
+                        continue
+                yield chunk
+        if compressor is not None:
+            yield compressor.flush()
+
+
+export_service = ExportService(chunk_rows=settings.EXPORT_CHUNK_ROWS)
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database.db import local_session
+from app.repositories.user_sessions import UserSessionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SessionActivityBuffer:
+    """
+    Write-behind buffer for ``user_sessions.last_activity``.
+
+    Validations only record a timestamp in memory; a background task flushes
+    the latest timestamp per session in batches of ``max_batch`` rows every
+    ``flush_interval`` seconds (or sooner, once a full batch is waiting).
+    """
+
+    def __init__(self, session_factory, flush_interval: float, max_batch: int):
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: dict[int, datetime] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.recorded = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+        self.last_flush_seconds = 0.0
+
+    def record(self, session_id: int, at: Optional[datetime] = None) -> None:
+        self._pending[session_id] = at or datetime.now(timezone.utc)
+        self.recorded += 1
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    def _take_batch(self) -> dict[int, datetime]:
+        batch = {}
+        for session_id in list(self._pending)[: self.max_batch]:
+            batch[session_id] = self._pending.pop(session_id)
+        return batch
+
+    def _requeue(self, batch: dict[int, datetime]) -> None:
+        # Put the batch back without overwriting newer timestamps
+        for session_id, at in batch.items():
+            self._pending.setdefault(session_id, at)
+
+    async def flush(self) -> int:
+        """Write every pending timestamp to the database, one bulk UPDATE per batch."""
+        flushed = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._take_batch()
+                start = time.perf_counter()
+                try:
+                    async with self._session_factory() as db:
+                        await UserSessionRepository(db).bulk_update_session_activity(batch)
+                except Exception as e:
+                    self._requeue(batch)
+                    self.failed_flushes += 1
+                    logger.error("Session activity flush failed: %s", e)
+                    break
+                except BaseException:
+                    # cancelled mid-write: keep the batch for whoever flushes next
+                    self._requeue(batch)
+                    raise
+                self.flushes += 1
+                self.flushed_rows += len(batch)
+                self.last_flush_seconds = time.perf_counter() - start
+                flushed += len(batch)
+        return flushed
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="session-activity-flusher")
+
+    async def stop(self) -> None:
+        """Stop the background flusher and drain whatever is still buffered."""
+        if self._task is not None:
+            # no cancel: a flush in progress finishes writing its batch, then
+            # the loop runs one last flush and exits
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_seconds": round(self.last_flush_seconds, 6),
+        }
+
+
+session_activity_buffer = SessionActivityBuffer(
+    session_factory=local_session,
+    flush_interval=settings.SESSION_ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    max_batch=settings.SESSION_ACTIVITY_FLUSH_MAX_BATCH,
+)
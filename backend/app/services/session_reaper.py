@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.database.db import async_engine
+from app.core.database.locks import SESSION_REAPER_LOCK, advisory_lock
+from app.repositories.user_sessions import UserSessionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SessionReaper:
+    """
+    Periodically deletes expired and long-logged-out sessions in small chunks.
+
+    Every worker runs the loop, but a run only proceeds on the worker that
+    wins the Postgres advisory lock, so with several uvicorn workers the
+    deletes still happen on exactly one of them at a time.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        interval: float,
+        batch_size: int,
+        batch_pause: float,
+        expired_retention: timedelta,
+        logged_out_retention: timedelta,
+    ):
+        self._engine = engine
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.expired_retention = expired_retention
+        self.logged_out_retention = logged_out_retention
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.skipped_runs = 0
+        self.failed_runs = 0
+        self.batches = 0
+        self.deleted_total = 0
+        self.current_run_deleted = 0
+        self.last_run_deleted = 0
+        self.last_run_seconds = 0.0
+        self.last_run_at: Optional[datetime] = None
+
+    async def run_once(self) -> int:
+        """Delete everything past retention, one chunk per transaction; returns rows deleted."""
+        async with advisory_lock(self._engine, SESSION_REAPER_LOCK) as conn:
+            if conn is None:
+                self.skipped_runs += 1
+                return 0
+
+            start = time.perf_counter()
+            now = datetime.now(timezone.utc)
+            self.current_run_deleted = 0
+            async with AsyncSession(bind=conn, expire_on_commit=False) as db:
+                repository = UserSessionRepository(db)
+                while True:
+                    deleted = await repository.delete_expired_sessions_batch(
+                        expired_before=now - self.expired_retention,
+                        logged_out_before=now - self.logged_out_retention,
+                        batch_size=self.batch_size,
+                    )
+                    if deleted:
+                        self.batches += 1
+                        self.current_run_deleted += deleted
+                        self.deleted_total += deleted
+                    if deleted < self.batch_size:
+                        break
+                    await asyncio.sleep(self.batch_pause)
+
+            self.runs += 1
+            self.last_run_deleted = self.current_run_deleted
+            self.last_run_seconds = time.perf_counter() - start
+            self.last_run_at = now
+            if self.last_run_deleted:
+                logger.info(
+                    "Session reaper deleted %d sessions in %.2f seconds.",
+                    self.last_run_deleted,
+                    self.last_run_seconds,
+                )
+            return self.last_run_deleted
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed_runs += 1
+                logger.error("Session reaper run failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="session-reaper")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "runs": self.runs,
+            "skipped_runs": self.skipped_runs,
+            "failed_runs": self.failed_runs,
+            "batches": self.batches,
+            "deleted_total": self.deleted_total,
+            "current_run_deleted": self.current_run_deleted,
+            "last_run_deleted": self.last_run_deleted,
+            "last_run_seconds": round(self.last_run_seconds, 6),
+            "last_run_at": self.last_run_at,
+        }
+
+
+session_reaper = SessionReaper(
+    engine=async_engine,
+    interval=settings.SESSION_REAPER_INTERVAL_SECONDS,
+    batch_size=settings.SESSION_REAPER_BATCH_SIZE,
+    batch_pause=settings.SESSION_REAPER_BATCH_PAUSE_SECONDS,
+    expired_retention=timedelta(days=settings.SESSION_RETENTION_EXPIRED_DAYS),
+    logged_out_retention=timedelta(days=settings.SESSION_RETENTION_LOGGED_OUT_DAYS),
+)
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database.db import local_session
+from app.repositories.stats import StatsRepository
+
+logger = logging.getLogger(__name__)
+
+
+class StatsSnapshot:
+    """
+    Cached dashboard statistics, recomputed in the background every
+    ``refresh_interval`` seconds.
+
+    Recomputation is single-flight: concurrent callers that find the snapshot
+    missing or stale all await the same in-flight query instead of starting
+    their own.
+    """
+
+    def __init__(self, session_factory, refresh_interval: float):
+        self._session_factory = session_factory
+        self.refresh_interval = refresh_interval
+        self._value: Optional[dict] = None
+        self._refreshed_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failed_refreshes = 0
+        self.coalesced = 0
+        self.last_refresh_seconds = 0.0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self._refreshed_at
+
+    async def _compute(self) -> dict:
+        start = time.perf_counter()
+        async with self._session_factory() as db:
+            value = await StatsRepository(db).get_dashboard_stats()
+        self._value = value
+        self._refreshed_at = time.monotonic()
+        self.refreshes += 1
+        self.last_refresh_seconds = time.perf_counter() - start
+        return value
+
+    def _clear_inflight(self, task: asyncio.Task) -> None:
+        if self._inflight is task:
+            self._inflight = None
+        if not task.cancelled() and task.exception() is not None:
+            self.failed_refreshes += 1
+
+    async def refresh(self) -> dict:
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._compute())
+            self._inflight.add_done_callback(self._clear_inflight)
+        else:
+            self.coalesced += 1
+        # shield: a cancelled caller must not cancel the query others are awaiting
+        return await asyncio.shield(self._inflight)
+
+    async def get(self) -> dict:
+        """Return the snapshot, recomputing it only when missing or older than two intervals."""
+        if self._value is not None and self.age < 2 * self.refresh_interval:
+            return self._value
+        return await self.refresh()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Stats snapshot refresh failed: %s", e)
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="stats-snapshot")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "age_seconds": round(self.age, 3) if self._value is not None else None,
+            "refresh_interval": self.refresh_interval,
+            "refreshes": self.refreshes,
+            "failed_refreshes": self.failed_refreshes,
+            "coalesced": self.coalesced,
+            "last_refresh_seconds": round(self.last_refresh_seconds, 6),
+        }
+
+
+stats_snapshot = StatsSnapshot(
+    session_factory=local_session,
+    refresh_interval=settings.STATS_SNAPSHOT_REFRESH_SECONDS,
+)
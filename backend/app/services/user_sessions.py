@@ -6,8 +6,11 @@ import hashlib
 
 from app.models.user import User
 from app.models.user_session import UserSession
+from app.schemas.user_session import SessionRevokeRequest
 from app.repositories.user_sessions import UserSessionRepository
+from app.services.session_activity import session_activity_buffer
 from app.core.config import settings
+from app.core.metrics import USER_SESSIONS_CREATED
 
 
 class UserSessionService:
@@ -48,7 +51,9 @@ class UserSessionService:
                 "expires_at": self._calculate_expires_at(),
             }
             
-            return await self.session_repository.create_session(session_data)
+            user_session = await self.session_repository.create_session(session_data)
+            USER_SESSIONS_CREATED.inc()
+            return user_session
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -60,8 +65,8 @@ class UserSessionService:
         try:
             session = await self.session_repository.get_session_by_token(session_token)
             if session:
-                # Atualiza última atividade
-                await self.session_repository.update_session_activity(session.id)
+                # Atualiza última atividade (gravada em lote pelo write-behind buffer)
+                session_activity_buffer.record(session.id)
             return session
         except Exception as e:
             raise HTTPException(
@@ -81,7 +86,6 @@ class UserSessionService:
                 session.last_activity = datetime.now(timezone.utc)
                 
                 await self.session_repository.session.commit()
-                await self.session_repository.session.refresh(session)
                 
                 return session
             return None
@@ -111,24 +115,31 @@ class UserSessionService:
                 detail=f"Error logging out all sessions: {e}"
             )
 
-    async def get_user_sessions(self, user_id: int) -> list[UserSession]:
-        """Busca todas as sessões ativas de um usuário"""
+    async def revoke_sessions(self, revoke_request: SessionRevokeRequest) -> dict:
+        """Revoga em lote as sessões ativas que casam com os filtros informados"""
         try:
-            return await self.session_repository.get_user_active_sessions(user_id)
+            revoked, batches = await self.session_repository.revoke_sessions(
+                user_ids=revoke_request.user_ids,
+                device_info=revoke_request.device_info,
+                ip_address=revoke_request.ip_address,
+                logged_in_before=revoke_request.logged_in_before,
+                batch_size=revoke_request.batch_size,
+            )
+            return {"revoked": revoked, "batches": batches}
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error getting user sessions: {e}"
+                detail=f"Error revoking sessions: {e}"
             )
 
-    async def get_session_stats(self) -> dict:
-        """Busca estatísticas de sessões"""
+    async def get_user_sessions(self, user_id: int) -> list[UserSession]:
+        """Busca todas as sessões ativas de um usuário"""
         try:
-            return await self.session_repository.get_session_stats()
+            return await self.session_repository.get_user_active_sessions(user_id)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error getting session stats: {e}"
+                detail=f"Error getting user sessions: {e}"
             )
 
     async def cleanup_expired_sessions(self) -> int:
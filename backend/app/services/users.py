@@ -1,10 +1,20 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional
+
 from fastapi import HTTPException, status
-from app.core.security import get_password_hash
+from app.core.security import hash_password
+from app.core.cache import user_cache
+from app.core.conditional import weak_etag
+from app.core.invalidation import CacheEvent
+from app.services.stats_snapshot import stats_snapshot
 from app.core.config import settings
 from app.models.user import User
-from app.schemas.user import UserSchema, UserRoleEnum
+from app.schemas.user import UserSchema, UserRoleEnum, UserListFilters
 from app.schemas.message import Message
-from app.repositories.users import UserRepository
+from app.repositories.users import UserRepository, USER_DETAIL_FIELDS
 from app.exceptions.messages import Except
 from app.exceptions.exceptions import UsernameAlreadyExists
 
@@ -27,8 +37,8 @@ class UserService:
                 detail=Except.not_allowed_403(),
             )
 
-    async def _get_user_or_404(self, user_id: int) -> User:
-        user = await self.user_repository.get_user_by_id(user_id)
+    async def _get_user_or_404(self, user_id: int, replica: bool = False) -> User:
+        user = await self.user_repository.get_user_by_id(user_id, replica=replica)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -50,7 +60,7 @@ class UserService:
         new_user = User(
             username=user_data.username,
             email=user_data.email,
-            password=get_password_hash(user_data.password),
+            password=await hash_password(user_data.password),
             role=user_data.role,
         )
 
@@ -77,15 +87,20 @@ class UserService:
                 detail=Except.bad_request_400("Username"),
             )
 
+        previous_username = user.username
         user.username = user_data.username
-        user.password = get_password_hash(user_data.password)
+        user.password = await hash_password(user_data.password)
         user.email = user_data.email
         user.role = user_data.role
 
         try:
-            return await self.user_repository.update_user(user)
+            updated_user = await self.user_repository.update_user(
+                user, event=CacheEvent.user_updated
+            )
         except Exception as e:
             raise HTTPException(status_code=500, detail=Except.error_updating_user(e))
+        user_cache.evict(username=previous_username, user_id=user_id)
+        return updated_user
 
     async def activate_or_deactivate_user(
         self, user_id: int, current_user: User
@@ -98,10 +113,13 @@ class UserService:
                 detail=Except.not_allowed_403(),
             )
         user.is_active = not user.is_active
+        event = CacheEvent.user_updated if user.is_active else CacheEvent.user_deactivated
         try:
-            return await self.user_repository.update_user(user)
+            updated_user = await self.user_repository.update_user(user, event=event)
         except Exception as e:
             raise HTTPException(status_code=500, detail=Except.error_updating_user(e))
+        user_cache.evict(username=user.username, user_id=user_id)
+        return updated_user
 
     async def get_all_users(self, current_user: User) -> list[User]:
         await self._is_admin(current_user)
@@ -110,9 +128,74 @@ class UserService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error retrieving users: {e}")
 
+    @staticmethod
+    def _encode_cursor(order_by: str, row) -> str:
+        key = [row.created_at.isoformat(), row.id] if order_by == "created_at" else [row.id]
+        raw = json.dumps({"order_by": order_by, "key": key}).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @staticmethod
+    def _decode_cursor(order_by: str, cursor: str) -> tuple:
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if data["order_by"] != order_by:
+                raise ValueError("cursor was issued for a different ordering")
+            if order_by == "created_at":
+                return datetime.fromisoformat(data["key"][0]), int(data["key"][1])
+            return (int(data["key"][0]),)
+        except (ValueError, KeyError, IndexError, TypeError, binascii.Error):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor.",
+            )
+
+    async def get_users_page(self, filters: UserListFilters, current_user: User) -> dict:
+        await self._is_admin(current_user)
+        after = (
+            self._decode_cursor(filters.order_by, filters.cursor)
+            if filters.cursor
+            else None
+        )
+        try:
+            rows, total = await self.user_repository.get_users_page(
+                limit=filters.limit,
+                order_by=filters.order_by,
+                after=after,
+                role=filters.role,
+                is_active=filters.is_active,
+                last_login_from=filters.last_login_from,
+                last_login_to=filters.last_login_to,
+                include_total=filters.include_total,
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error retrieving users: {e}")
+
+        next_cursor = None
+        if len(rows) > filters.limit:
+            rows = rows[: filters.limit]
+            next_cursor = self._encode_cursor(filters.order_by, rows[-1])
+
+        return {"users": rows, "next_cursor": next_cursor, "total_estimate": total}
+
+    @staticmethod
+    def users_page_payload(page: dict) -> dict:
+        """``UserList``-shaped payload straight from the page's row tuples, for ``TrustedJSONResponse``"""
+        return {**page, "users": [dict(zip(USER_DETAIL_FIELDS, row)) for row in page["users"]]}
+
+    async def get_user_etag(self, user_id: int, current_user: User) -> Optional[str]:
+        """
+        Current ETag of a user resource, for If-None-Match. The caller's own
+        record comes from the authenticated principal (no query), anyone else's
+        from an index-only read of ``update_at``. None if there is no validator.
+        """
+        await self._is_owner_or_admin(user_id, current_user)
+        if current_user.id == user_id and current_user.update_at is not None:
+            return weak_etag(user_id, current_user.update_at)
+        return weak_etag(user_id, await self.user_repository.get_user_version(user_id))
+
     async def get_user_by_id(self, user_id: int, current_user: User) -> User:
         await self._is_owner_or_admin(user_id, current_user)
-        return await self._get_user_or_404(user_id)
+        return await self._get_user_or_404(user_id, replica=True)
 
     async def delete_user(self, user_id: int, current_user: User) -> Message:
         user = await self._get_user_or_404(user_id)
@@ -124,6 +207,7 @@ class UserService:
             )
         try:
             await self.user_repository.delete_user(user_id)
+            user_cache.evict(username=user.username, user_id=user_id)
             return Message(message=f"User {user_id} deleted successfully")
         except Exception as e:
             raise HTTPException(
@@ -133,24 +217,12 @@ class UserService:
     async def get_user_stats(self, current_user: User) -> dict:
         await self._is_admin(current_user)
         try:
-            user_stats = await self.user_repository.get_user_stats()
-            
-            from app.repositories.user_sessions import UserSessionRepository
-            from app.services.user_sessions import UserSessionService
-            
-            session_repo = UserSessionRepository(self.user_repository.session)
-            session_service = UserSessionService(session_repo)
-            session_stats = await session_service.get_session_stats()
-            
-            return {
-                **user_stats,
-                **session_stats
-            }
+            return await stats_snapshot.get()
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error retrieving user stats: {e}")
 
-    async def update_last_login(self, user: User):
+    async def update_last_login(self, user: User, commit: bool = True):
         try:
-            await self.user_repository.update_last_login(user)
+            await self.user_repository.update_last_login(user, commit=commit)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error updating last login: {e}")
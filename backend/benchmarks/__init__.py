@@ -0,0 +1,4 @@
+"""
+Stand-alone benchmarks and performance checks for the backend.
+Run them from backend/ with ``python -m benchmarks.<module>``.
+"""
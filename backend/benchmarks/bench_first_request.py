@@ -0,0 +1,97 @@
+"""
+First-request latency after a (re)start, with and without pool warm-up.
+
+Starts a fresh single-worker uvicorn server per round, waits for it to
+accept connections (uvicorn only does so once the lifespan startup, warm-up
+included, has finished), then times the first few authenticated
+GET /users/me requests. With DB_POOL_WARMUP_CONNECTIONS=0 the first request
+opens its database connection and runs asyncpg's type introspection and
+statement preparation on the hot path; with warm-up it finds them ready.
+
+Needs a reachable database at DATABASE_URL with the schema applied and the
+root user seeded (ADD_ROOT_USER). The token is signed locally, so login and
+bcrypt stay out of the measurement.
+
+Usage (from backend/):
+    python -m benchmarks.bench_first_request [--rounds 5] [--requests 5] [--warmup 2]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import _env  # noqa: F401
+
+import httpx  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+
+
+def _wait_until_live(client: httpx.Client, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            if client.get("/health/live").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError("server did not start in time")
+
+
+def run_round(port: int, warmup: int, requests: int, token: str) -> list[float]:
+    env = {
+        **os.environ,
+        "DB_POOL_WARMUP_CONNECTIONS": str(warmup),
+        "METRICS_DIR": "",
+        "LOGIN_RATE_LIMIT_FILE": "",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30.0) as client:
+            _wait_until_live(client, process)
+            # let startup background work (stats snapshot, reaper) settle in both cases
+            time.sleep(1.0)
+            headers = {"Authorization": f"Bearer {token}"}
+            timings = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.get("/users/me", headers=headers)
+                timings.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+            return timings
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=settings.DB_POOL_WARMUP_CONNECTIONS)
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+
+    token = create_access_token(data={"sub": settings.ROOT_USERNAME})
+    print(f"GET /users/me after a fresh start, median of {args.rounds} rounds (ms)")
+    print(f"{'warm-up':>18}  " + "  ".join(f"{f'#{i + 1}':>7}" for i in range(args.requests)))
+    for warmup in (0, args.warmup):
+        rounds = [run_round(args.port, warmup, args.requests, token) for _ in range(args.rounds)]
+        medians = [statistics.median(column) for column in zip(*rounds)]
+        label = "off" if warmup == 0 else f"{warmup} connections"
+        print(f"{label:>18}  " + "  ".join(f"{value:7.2f}" for value in medians))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Micro-benchmark: per-request CPU spent verifying the same access token,
+with a full ``jwt.decode`` versus the verified-payload cache.
+
+Usage (from backend/):
+    python -m benchmarks.bench_jwt_cache [iterations]
+"""
+import sys
+import time
+
+from benchmarks import _env  # noqa: F401
+
+from jwt import decode  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.cache import token_cache  # noqa: E402
+from app.core.security import create_access_token, decode_token  # noqa: E402
+
+
+def _cpu_per_call(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations
+
+
+def main(iterations: int = 200_000) -> None:
+    token = create_access_token({"sub": "benchmark-user"})
+
+    uncached = _cpu_per_call(
+        lambda: decode(token, settings.SECRET_KEY_HASH, algorithms=[settings.ALGORITHM]),
+        iterations,
+    )
+
+    token_cache.clear()
+    decode_token(token)
+    cached = _cpu_per_call(lambda: decode_token(token), iterations)
+
+    print(f"iterations:           {iterations}")
+    print(f"jwt.decode:           {uncached * 1e6:8.2f} us/call")
+    print(f"decode_token (cached): {cached * 1e6:8.2f} us/call")
+    print(f"CPU saved per request: {(uncached - cached) * 1e6:8.2f} us ({uncached / cached:.1f}x)")
+    print(f"cache stats:          {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,137 @@
+"""
+Log pipeline cost: the synchronous loguru text handler (LOG_FORMAT=text)
+against the queued JSON writer (LOG_FORMAT=json).
+
+1. Throughput: records per second the calling thread can emit into a sink
+   that costs nothing, and for the queued writer how long until the queue
+   is drained.
+2. Event loop impact: a ticker task sleeps 1 ms in a loop and records how
+   late it wakes up while another task logs bursts (like busy request
+   handlers) into a slow sink, e.g. stderr piped to a log shipper that is
+   falling behind (--sink-latency-us per write call).
+
+No database needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_logging [--records 50000] [--sink-latency-us 200]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from benchmarks import _env  # noqa: F401
+
+from app.logging_config import InterceptHandler, JsonQueueHandler  # noqa: E402
+
+
+class Sink:
+    """File-like sink (text and bytes) that blocks ``latency`` seconds per write"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.writes = 0
+
+    def write(self, data) -> int:
+        self.writes += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def _logger(handler: logging.Handler) -> logging.Logger:
+    log = logging.getLogger(f"bench.{id(handler)}")
+    log.handlers[:] = [handler]
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    return log
+
+
+def _handler(kind: str, sink: Sink, queue_size: int) -> logging.Handler:
+    if kind == "text":
+        return InterceptHandler(stream=sink)
+    return JsonQueueHandler(stream=sink, maxsize=queue_size)
+
+
+def throughput(kind: str, records: int, queue_size: int) -> str:
+    handler = _handler(kind, Sink(), queue_size)
+    log = _logger(handler)
+    start = time.perf_counter()
+    for i in range(records):
+        log.info("user %s logged in from %s", i, "10.0.0.1")
+    emitted = time.perf_counter() - start
+    line = f"{kind:>5}: {records / emitted:10,.0f} records/s emitted"
+    if isinstance(handler, JsonQueueHandler):
+        while handler.stats()["queued"]:
+            time.sleep(0.001)
+        drained = time.perf_counter() - start
+        stats = handler.stats()
+        line += f", all written after {drained * 1000:.0f} ms ({stats['written']} written, {stats['dropped']} dropped)"
+    handler.close()
+    return line
+
+
+async def loop_lag(kind: str, latency: float, queue_size: int, seconds: float, burst: int) -> str:
+    sink = Sink(latency)
+    handler = _handler(kind, sink, queue_size)
+    log = _logger(handler)
+    lags = []
+    stop = time.perf_counter() + seconds
+
+    async def ticker():
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - start - 0.001) * 1000)
+
+    async def load():
+        i = 0
+        while time.perf_counter() < stop:
+            for _ in range(burst):
+                log.info("request %s served in %.1f ms", i, 3.2)
+                i += 1
+            await asyncio.sleep(0.005)
+        return i
+
+    _, emitted = await asyncio.gather(ticker(), load())
+    lags.sort()
+    line = (
+        f"{kind:>5}: loop lag p50 {statistics.median(lags):6.2f} ms  p99 {lags[int(len(lags) * 0.99)]:7.2f} ms"
+        f"  max {lags[-1]:7.2f} ms  ({emitted} records logged"
+    )
+    if isinstance(handler, JsonQueueHandler):
+        line += f", {handler.stats()['dropped']} dropped at the full queue"
+    handler.close()
+    return line + ")"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument("--sink-latency-us", type=float, default=200.0)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--burst", type=int, default=20, help="records logged every 5 ms")
+    args = parser.parse_args()
+
+    print(f"Throughput, {args.records} records into a free sink")
+    for kind in ("text", "json"):
+        print("  " + throughput(kind, args.records, args.queue_size))
+
+    print(
+        f"\nEvent loop lag, {args.burst} records / 5 ms for {args.seconds:.0f} s "
+        f"into a sink blocking {args.sink_latency_us:.0f} us per write"
+    )
+    for kind in ("text", "json"):
+        line = asyncio.run(
+            loop_lag(kind, args.sink_latency_us / 1e6, args.queue_size, args.seconds, args.burst)
+        )
+        print("  " + line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Count database round trips for the /auth/login and POST /users write paths,
+before (commit + refresh per write) and after (RETURNING, single commit).
+
+Needs a reachable database at DATABASE_URL with the schema applied. A
+throwaway user is created and removed by the script.
+
+Usage (from backend/):
+    python -m benchmarks.bench_login_round_trips
+"""
+import asyncio
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import _env  # noqa: F401
+
+from sqlalchemy import delete, event, select  # noqa: E402
+
+from app.core.database.db import async_engine, local_session  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.user_session import UserSession  # noqa: E402
+from app.repositories.users import UserRepository  # noqa: E402
+from app.repositories.user_sessions import UserSessionRepository  # noqa: E402
+
+
+class RoundTripCounter:
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def reset(self):
+        self.statements = 0
+        self.commits = 0
+
+    @property
+    def total(self) -> int:
+        return self.statements + self.commits
+
+
+counter = RoundTripCounter()
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_statement(*_):
+    counter.statements += 1
+
+
+@event.listens_for(async_engine.sync_engine, "commit")
+def _count_commit(*_):
+    counter.commits += 1
+
+
+def _session_data(user_id: int) -> dict:
+    return {
+        "user_id": user_id,
+        "session_token": secrets.token_urlsafe(32),
+        "refresh_token": secrets.token_urlsafe(32),
+        "expires_at": datetime.now(timezone.utc) + timedelta(minutes=5),
+    }
+
+
+async def legacy_login(username: str) -> None:
+    async with local_session() as db:
+        user = await db.scalar(select(User).where(User.username == username))
+        user.last_login = datetime.now(timezone.utc)
+        await db.commit()
+        await db.refresh(user)
+        user_session = UserSession(**_session_data(user.id))
+        db.add(user_session)
+        await db.commit()
+        await db.refresh(user_session)
+
+
+async def current_login(username: str) -> None:
+    async with local_session() as db:
+        user_repo = UserRepository(db)
+        user = await user_repo.get_user_by_username(username)
+        await user_repo.update_last_login(user, commit=False)
+        await UserSessionRepository(db).create_session(_session_data(user.id))
+
+
+async def legacy_create_user(username: str) -> None:
+    async with local_session() as db:
+        user = User(username=username, email=f"{username}@example.com", password="x")
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+
+
+async def current_create_user(username: str) -> None:
+    async with local_session() as db:
+        await UserRepository(db).add_user(
+            User(username=username, email=f"{username}@example.com", password="x")
+        )
+
+
+async def _measure(label: str, fn, *args) -> int:
+    counter.reset()
+    await fn(*args)
+    print(
+        f"{label:<28} {counter.statements:>3} statements + {counter.commits} commits"
+        f" = {counter.total} round trips"
+    )
+    return counter.total
+
+
+async def _cleanup(*usernames: str) -> None:
+    async with local_session() as db:
+        user_ids = select(User.id).where(User.username.in_(usernames))
+        await db.execute(delete(UserSession).where(UserSession.user_id.in_(user_ids)))
+        await db.execute(delete(User).where(User.username.in_(usernames)))
+        await db.commit()
+
+
+async def main() -> None:
+    legacy_name = f"bench_{secrets.token_hex(4)}"
+    current_name = f"bench_{secrets.token_hex(4)}"
+    try:
+        await _measure("POST /users (before)", legacy_create_user, legacy_name)
+        await _measure("POST /users (after)", current_create_user, current_name)
+        await _measure("/auth/login (before)", legacy_login, legacy_name)
+        await _measure("/auth/login (after)", current_login, current_name)
+    finally:
+        await _cleanup(legacy_name, current_name)
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark: per-call CPU spent turning the username lookup into SQL,
+building ``select(User).where(...)`` on every call (as before) versus the
+pre-built ``USER_BY_USERNAME`` from ``app.repositories.statements``.
+
+Both go through SQLAlchemy's compiled cache (``_compile_w_cache``, what
+``Connection.execute`` calls), so the difference is construction plus cache
+key generation, which the pre-built statement memoizes.
+
+With ``--db`` it also runs the lookup through a session against DATABASE_URL
+and prints the compiled / prepared statement cache hit rates.
+
+Usage (from backend/):
+    python -m benchmarks.bench_statement_cache [iterations] [--db]
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks import _env  # noqa: F401
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.util import LRUCache  # noqa: E402
+
+import app.main  # noqa: E402,F401  (configures all mappers)
+from app.core.config import settings  # noqa: E402
+from app.core.database.db import async_engine, local_session, statement_cache  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.statements import USER_BY_USERNAME  # noqa: E402
+
+DIALECT = postgresql.asyncpg.dialect()
+
+
+def _compile(stmt, cache: LRUCache):
+    compiled, _, _ = stmt._compile_w_cache(
+        dialect=DIALECT,
+        compiled_cache=cache,
+        column_keys=[],
+        for_executemany=False,
+        schema_translate_map=None,
+    )
+    return compiled
+
+
+def _cpu_per_call(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations
+
+
+def compile_overhead(iterations: int) -> None:
+    cache = LRUCache(500)
+    inline = _cpu_per_call(
+        lambda: _compile(select(User).where(User.username == "benchmark-user"), cache), iterations
+    )
+    prebuilt = _cpu_per_call(lambda: _compile(USER_BY_USERNAME, cache), iterations)
+
+    print(f"iterations:                 {iterations}")
+    print(f"select() per call:          {inline * 1e6:8.2f} us/call")
+    print(f"pre-built USER_BY_USERNAME: {prebuilt * 1e6:8.2f} us/call")
+    print(f"CPU saved per lookup:       {(inline - prebuilt) * 1e6:8.2f} us ({inline / prebuilt:.1f}x)")
+    print(f"compiled cache entries:     {len(cache)}")
+
+
+async def db_round_trips(iterations: int) -> None:
+    async with local_session() as session:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await session.scalar(select(User).where(User.username == settings.ROOT_USERNAME))
+        inline = (time.perf_counter() - start) / iterations
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await session.scalar(USER_BY_USERNAME, {"username": settings.ROOT_USERNAME})
+        prebuilt = (time.perf_counter() - start) / iterations
+
+    print(f"\nsession round trips:        {iterations}")
+    print(f"select() per call:          {inline * 1e6:8.1f} us/lookup")
+    print(f"pre-built USER_BY_USERNAME: {prebuilt * 1e6:8.1f} us/lookup")
+    print(f"statement caches:           {statement_cache.stats()}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--db"]
+    n = int(args[0]) if args else 50_000
+    compile_overhead(n)
+    if "--db" in sys.argv:
+        asyncio.run(db_round_trips(min(n, 5_000)))
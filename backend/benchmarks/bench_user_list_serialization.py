@@ -0,0 +1,103 @@
+"""
+Benchmark: serializing a GET /users page of 10k users, through the route's
+``response_model`` (validation from attributes incl. EmailStr, then
+``jsonable_encoder`` and stdlib ``json``) versus ``TrustedJSONResponse`` built
+from the row tuples (FAST_JSON_RESPONSES).
+
+Rows are synthetic by default; with ``--db`` the page is read from
+DATABASE_URL (e.g. the seed_scale_fixture data). Both paths must produce the
+same JSON.
+
+Usage (from backend/):
+    python -m benchmarks.bench_user_list_serialization [rows] [--db]
+"""
+import asyncio
+import json
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import _env  # noqa: F401
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+
+from app.core.database.db import async_engine, local_session  # noqa: E402
+from app.core.responses import TrustedJSONResponse  # noqa: E402
+from app.main import app  # noqa: E402
+from app.repositories.users import USER_DETAIL_FIELDS, UserRepository  # noqa: E402
+from app.schemas.user import UserRoleEnum  # noqa: E402
+from app.services.users import UserService  # noqa: E402
+
+UserRow = namedtuple("UserRow", USER_DETAIL_FIELDS)
+
+
+def synthetic_rows(n: int) -> list:
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        UserRow(
+            i,
+            f"user_{i:09d}",
+            f"user_{i:09d}@example.com",
+            UserRoleEnum.admin if i % 50 == 0 else UserRoleEnum.user,
+            i % 7 != 0,
+            base + timedelta(seconds=i, microseconds=i % 1000),
+            base + timedelta(days=1, seconds=i),
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+async def database_rows(n: int) -> list:
+    async with local_session() as session:
+        rows, _ = await UserRepository(session).get_users_page(limit=n - 1)
+    await async_engine.dispose()
+    return rows
+
+
+def _route_field():
+    for route in app.routes:
+        if getattr(route, "path", None) == "/users" and "GET" in route.methods:
+            return route.response_field
+    raise RuntimeError("GET /users route not found")
+
+
+async def main(n: int, from_db: bool) -> None:
+    rows = await database_rows(n) if from_db else synthetic_rows(n)
+    page = {"users": rows, "next_cursor": "abc", "total_estimate": len(rows)}
+    field = _route_field()
+
+    async def current() -> bytes:
+        content = await serialize_response(field=field, response_content=page)
+        return JSONResponse(content).body
+
+    def fast() -> bytes:
+        return TrustedJSONResponse(UserService.users_page_payload(page)).body
+
+    # warm up and check both paths agree
+    expected = await current()
+    body = fast()
+    assert json.loads(expected) == json.loads(body), "fast path output differs"
+
+    repeats = 5
+    start = time.process_time()
+    for _ in range(repeats):
+        await current()
+    current_s = (time.process_time() - start) / repeats
+
+    start = time.process_time()
+    for _ in range(repeats):
+        fast()
+    fast_s = (time.process_time() - start) / repeats
+
+    print(f"rows:                          {len(rows)} ({'database' if from_db else 'synthetic'})")
+    print(f"response_model + json:         {current_s * 1000:8.1f} ms CPU/response")
+    print(f"TrustedJSONResponse:           {fast_s * 1000:8.1f} ms CPU/response")
+    print(f"speedup:                       {current_s / fast_s:8.1f}x")
+    print(f"identical bytes:               {expected == body} ({len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--db"]
+    asyncio.run(main(int(args[0]) if args else 10_000, "--db" in sys.argv))
@@ -0,0 +1,220 @@
+"""
+Plan regression check: run every repository query against a seeded database,
+EXPLAIN each statement it sends and fail if any plan sequentially scans a
+large table.
+
+Each case calls the real repository method on a connection whose outer
+transaction is rolled back at the end (repository commits become savepoint
+releases), so writes are planned exactly as the app sends them and nothing is
+kept. Statements are captured from the engine's cursor events and re-sent as
+``EXPLAIN (FORMAT JSON)`` with the same parameters.
+
+Tables with fewer than ``--min-rows`` estimated rows are ignored - the planner
+rightly prefers a sequential scan there - so seed first:
+    python -m benchmarks.seed_scale_fixture --truncate
+
+Usage (from backend/):
+    python -m benchmarks.explain_check [--verbose]
+
+Exits with status 1 when a non-allowed sequential scan is found.
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import sys
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import _env  # noqa: F401
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.core.database.db import async_engine  # noqa: E402
+from app.repositories.stats import StatsRepository  # noqa: E402
+from app.repositories.users import UserRepository  # noqa: E402
+from app.repositories.user_sessions import UserSessionRepository  # noqa: E402
+from app.schemas.user import UserRoleEnum  # noqa: E402
+
+LARGE_TABLES = ("users", "user_sessions")
+
+# Queries that read a whole table by design, and the tables they may scan.
+FULL_SCAN_ALLOWED = {
+    # total user count / per-role breakdown need every users row
+    "stats.get_dashboard_stats": {"users"},
+    # admin revocation by device/IP has no selective predicate to index
+    "sessions.revoke_sessions(ip_address)": {"user_sessions"},
+    # exports stream the whole table
+    "users.export_users_query": {"users"},
+    "sessions.export_sessions_query": {"user_sessions"},
+}
+
+SKIPPED_PREFIXES = ("EXPLAIN", "SAVEPOINT", "RELEASE", "ROLLBACK", "SELECT reltuples")
+
+
+class StatementCapture:
+    def __init__(self):
+        self.enabled = False
+        self.statements: list[tuple[str, object]] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if not self.enabled or statement.lstrip().upper().startswith(SKIPPED_PREFIXES):
+            return
+        if executemany:
+            parameters = parameters[0]
+        self.statements.append((statement, parameters))
+
+
+def _seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name")
+    for child in plan.get("Plans", ()):
+        yield from _seq_scans(child)
+
+
+async def _cases(conn) -> list:
+    """(name, coroutine factory taking a session) for every repository query"""
+    sample = (
+        await conn.execute(
+            text(
+                "SELECT s.id, s.user_id, s.session_token, s.refresh_token, s.ip_address, u.username,"
+                " (SELECT min(expires_at) FROM user_sessions) AS oldest_expiry,"
+                " (SELECT min(logout_at) FROM user_sessions WHERE NOT is_active) AS oldest_logout"
+                " FROM user_sessions s JOIN users u ON u.id = s.user_id"
+                " WHERE s.is_active ORDER BY s.id DESC LIMIT 1"
+            )
+        )
+    ).mappings().first()
+    if sample is None:
+        raise SystemExit("No active session found - seed the database first.")
+
+    now = datetime.now(timezone.utc)
+    last_week = now - timedelta(days=7)
+    sessions = UserSessionRepository
+    users = UserRepository
+
+    def new_session(user_id):
+        return {
+            "user_id": user_id,
+            "session_token": secrets.token_urlsafe(32),
+            "refresh_token": secrets.token_urlsafe(32),
+            "device_info": None,
+            "ip_address": None,
+            "user_agent": None,
+            "expires_at": now + timedelta(minutes=5),
+        }
+
+    async def export(db, stmt):
+        await db.execute(stmt.limit(1))
+
+    return [
+        ("users.get_user_by_id", lambda db: users(db).get_user_by_id(sample["user_id"])),
+        ("users.get_user_version", lambda db: users(db).get_user_version(sample["user_id"])),
+        ("users.get_user_by_username", lambda db: users(db).get_user_by_username(sample["username"])),
+        ("users.get_existing_usernames", lambda db: users(db).get_existing_usernames([sample["username"], "nobody"])),
+        ("users.bulk_insert_users", lambda db: users(db).bulk_insert_users([
+            {"username": f"explain_{secrets.token_hex(6)}", "email": "x@example.com", "password": "x", "role": UserRoleEnum.user}
+        ])),
+        ("users.get_users_page(id)", lambda db: users(db).get_users_page(100, after=(sample["user_id"],))),
+        ("users.get_users_page(created_at)", lambda db: users(db).get_users_page(100, order_by="created_at", after=(last_week, 0))),
+        ("users.get_users_page(last_login)", lambda db: users(db).get_users_page(
+            100, last_login_from=now - timedelta(hours=1), include_total=True
+        )),
+        ("users.update_last_login", lambda db: _update_last_login(db, sample["user_id"])),
+        ("users.export_users_query", lambda db: export(db, users.export_users_query())),
+        ("sessions.create_session", lambda db: sessions(db).create_session(new_session(sample["user_id"]))),
+        ("sessions.get_session_by_token", lambda db: sessions(db).get_session_by_token(sample["session_token"])),
+        ("sessions.get_session_by_refresh_token", lambda db: sessions(db).get_session_by_refresh_token(sample["refresh_token"])),
+        ("sessions.bulk_update_session_activity", lambda db: sessions(db).bulk_update_session_activity({sample["id"]: now})),
+        ("sessions.get_user_active_sessions", lambda db: sessions(db).get_user_active_sessions(sample["user_id"])),
+        ("sessions.logout_session", lambda db: sessions(db).logout_session(sample["session_token"])),
+        ("sessions.logout_all_user_sessions", lambda db: sessions(db).logout_all_user_sessions(sample["user_id"])),
+        ("sessions.revoke_sessions(user_ids)", lambda db: sessions(db).revoke_sessions(user_ids=[sample["user_id"]])),
+        ("sessions.revoke_sessions(logged_in_before)", lambda db: sessions(db).revoke_sessions(
+            logged_in_before=now - timedelta(days=365), batch_size=100
+        )),
+        ("sessions.revoke_sessions(ip_address)", lambda db: sessions(db).revoke_sessions(ip_address=sample["ip_address"])),
+        # steady state: the reaper runs often, so each pass only sees a thin slice
+        ("sessions.delete_expired_sessions_batch", lambda db: sessions(db).delete_expired_sessions_batch(
+            expired_before=sample["oldest_expiry"] + timedelta(hours=1),
+            logged_out_before=(sample["oldest_logout"] or now) + timedelta(hours=1),
+            batch_size=100,
+        )),
+        ("sessions.export_sessions_query", lambda db: export(db, sessions.export_sessions_query(login_from=last_week))),
+        ("stats.get_dashboard_stats", lambda db: StatsRepository(db).get_dashboard_stats()),
+    ]
+
+
+async def _update_last_login(db, user_id: int) -> None:
+    repository = UserRepository(db)
+    await repository.update_last_login(await repository.get_user_by_id(user_id))
+
+
+async def main(args: argparse.Namespace) -> int:
+    capture = StatementCapture()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    failures = 0
+
+    async with async_engine.connect() as conn:
+        sizes = dict(
+            (
+                await conn.execute(
+                    text("SELECT relname, reltuples FROM pg_class WHERE relname = ANY(:names)"),
+                    {"names": list(LARGE_TABLES)},
+                )
+            ).all()
+        )
+        large = {name for name, rows in sizes.items() if rows >= args.min_rows}
+        print("table sizes: " + ", ".join(f"{name}={int(rows):,}" for name, rows in sizes.items()))
+        if not large:
+            print(f"no table has {args.min_rows:,}+ rows; nothing to check (seed first)")
+            return 1
+
+        # the size query autobegan the outer transaction every case runs in
+        try:
+            for name, call in await _cases(conn):
+                db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+                capture.statements.clear()
+                capture.enabled = True
+                try:
+                    await call(db)
+                finally:
+                    capture.enabled = False
+
+                allowed = FULL_SCAN_ALLOWED.get(name, set())
+                case_failures = 0
+                for statement, parameters in capture.statements:
+                    plan = await conn.exec_driver_sql(
+                        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                    )
+                    plan = plan.scalar()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    scans = {rel for rel in _seq_scans(plan[0]["Plan"]) if rel in large}
+                    bad = scans - allowed
+                    status = "FAIL" if bad else ("allowed" if scans else "ok")
+                    if bad:
+                        case_failures += 1
+                    if bad or args.verbose:
+                        print(f"[{status:>7}] {name}: {' '.join(statement.split())[:160]}")
+                        if bad:
+                            print(f"          seq scan on {', '.join(sorted(bad))}")
+                    if args.verbose:
+                        print(json.dumps(plan[0]["Plan"], indent=2))
+                if not args.verbose and not case_failures:
+                    print(f"[     ok] {name} ({len(capture.statements)} statements)")
+                failures += case_failures
+                await db.close()
+        finally:
+            await conn.rollback()
+
+    await async_engine.dispose()
+    print(f"{failures} statement(s) with unexpected sequential scans")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--min-rows", type=int, default=10_000, help="smallest table to check")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    sys.exit(asyncio.run(main(parser.parse_args())))
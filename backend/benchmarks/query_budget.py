@@ -0,0 +1,70 @@
+"""
+Per-endpoint query budgets: call each route in-process and fail if it runs
+more statements than allowed, printing what it ran.
+
+Uses ``assert_max_queries`` around httpx calls through the ASGI app, so the
+counts are exactly what the Server-Timing header reports. Budgets are for a
+cold worker (empty user/token caches).
+
+Needs a reachable database at DATABASE_URL with the schema applied and the
+root user seeded (ADD_ROOT_USER), logging in as ROOT_USERNAME/ROOT_PASSWORD.
+
+Usage (from backend/):
+    python -m benchmarks.query_budget
+"""
+import asyncio
+import sys
+
+from benchmarks import _env  # noqa: F401
+
+import httpx  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database.db import async_engine  # noqa: E402
+from app.core.database.query_stats import assert_max_queries  # noqa: E402
+from app.main import app  # noqa: E402
+
+# (method, path, max statements)
+BUDGETS = [
+    ("POST", "/auth/login", 4),  # + cache invalidation NOTIFY for last_login
+    ("GET", "/users/me", 2),
+    ("GET", "/users", 1),
+    ("GET", "/users/session/stats", 1),
+    ("POST", "/auth/logout", 2),  # UPDATE ... RETURNING + cache invalidation NOTIFY
+]
+
+
+async def main() -> int:
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+        headers = {}
+        for method, path, budget in BUDGETS:
+            kwargs = {"headers": headers}
+            if path == "/auth/login":
+                kwargs["data"] = {
+                    "username": settings.ROOT_USERNAME,
+                    "password": settings.ROOT_PASSWORD,
+                }
+            try:
+                async with assert_max_queries(budget) as stats:
+                    response = await client.request(method, path, **kwargs)
+                status = "ok"
+            except AssertionError as e:
+                failures += 1
+                status = f"OVER BUDGET\n{e}"
+                response = None
+            print(f"{method:<6} {path:<24} {stats.queries:>2}/{budget} queries  {status}")
+
+            if response is not None and response.status_code >= 400:
+                print(f"       unexpected {response.status_code}: {response.text[:200]}")
+                failures += 1
+            if path == "/auth/login" and response is not None and response.status_code == 200:
+                headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    await async_engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
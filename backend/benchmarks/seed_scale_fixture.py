@@ -0,0 +1,167 @@
+"""
+Seed a large users/user_sessions fixture through COPY, for plan checks and
+load tests at realistic table sizes.
+
+Rows are generated deterministically (``--seed``) in chunks and streamed with
+asyncpg's ``copy_records_to_table``, then the tables are VACUUM ANALYZEd so
+the planner sees real statistics. Usernames are prefixed with ``fixture_`` and
+every user shares one precomputed bcrypt hash of ``--password``.
+
+Needs a reachable database at DATABASE_URL with the schema applied
+(``alembic upgrade head``).
+
+Usage (from backend/):
+    python -m benchmarks.seed_scale_fixture --users 1000000 --sessions 3000000
+    python -m benchmarks.seed_scale_fixture --truncate   # wipe both tables first
+"""
+import argparse
+import asyncio
+import random
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import _env  # noqa: F401
+
+import asyncpg  # noqa: E402
+import bcrypt  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+
+USER_COLUMNS = (
+    "username", "password", "email", "update_at", "created_at",
+    "is_active", "role", "last_login",
+)
+SESSION_COLUMNS = (
+    "user_id", "session_token", "refresh_token", "device_info", "ip_address",
+    "user_agent", "login_at", "last_activity", "logout_at", "expires_at", "is_active",
+)
+DEVICES = ("desktop", "mobile", "tablet", "hardware", None)
+AGENTS = ("Mozilla/5.0", "okhttp/4.12", "python-httpx/0.28", None)
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _user_rows(start: int, count: int, password: str, now: datetime, rng: random.Random):
+    for i in range(start, start + count):
+        created_at = now - timedelta(seconds=rng.randrange(2 * 365 * 86400))
+        # most users logged in recently, a long tail never did
+        if rng.random() < 0.85:
+            last_login = now - timedelta(seconds=int(rng.expovariate(1 / (7 * 86400))))
+            last_login = max(last_login, created_at)
+        else:
+            last_login = None
+        role = rng.choices(("user", "hardware", "admin"), weights=(98.9, 1, 0.1))[0]
+        yield (
+            f"fixture_{i:09d}",
+            password,
+            f"fixture_{i:09d}@example.com",
+            created_at,
+            created_at,
+            rng.random() < 0.9,
+            role,
+            last_login,
+        )
+
+
+def _session_rows(start: int, count: int, user_ids: list[int], now: datetime, rng: random.Random):
+    token_prefix = secrets.token_hex(4)
+    for i in range(start, start + count):
+        login_at = now - timedelta(seconds=int(rng.expovariate(1 / (10 * 86400))))
+        expires_at = login_at + timedelta(minutes=60)
+        # only a small share of recent sessions is still active
+        active = expires_at > now and rng.random() < 0.8
+        if active:
+            last_activity = login_at + timedelta(seconds=rng.randrange(3600))
+            last_activity = min(last_activity, now)
+            logout_at = None
+        elif rng.random() < 0.6:
+            last_activity = login_at + timedelta(seconds=rng.randrange(3600))
+            logout_at = last_activity
+        else:
+            last_activity = login_at + timedelta(seconds=rng.randrange(3600))
+            logout_at = None
+        yield (
+            rng.choice(user_ids),
+            f"fx{token_prefix}{i:010d}",
+            f"fr{token_prefix}{i:010d}",
+            rng.choice(DEVICES),
+            f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+            rng.choice(AGENTS),
+            login_at,
+            last_activity,
+            logout_at,
+            expires_at,
+            active,
+        )
+
+
+async def _copy(conn, table: str, columns: tuple, rows, total: int, chunk: int) -> None:
+    start = time.perf_counter()
+    for offset in range(0, total, chunk):
+        records = list(rows(offset, min(chunk, total - offset)))
+        await conn.copy_records_to_table(table, records=records, columns=columns)
+        done = offset + len(records)
+        rate = done / (time.perf_counter() - start)
+        print(f"\r{table}: {done:>10,}/{total:,} ({rate:,.0f} rows/s)", end="", flush=True)
+    print()
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    password = bcrypt.hashpw(args.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+    conn = await asyncpg.connect(_asyncpg_dsn(settings.DATABASE_URL))
+    try:
+        if args.truncate:
+            await conn.execute("TRUNCATE user_sessions, users RESTART IDENTITY CASCADE")
+
+        first = await conn.fetchval(
+            "SELECT count(*) FROM users WHERE username LIKE 'fixture\\_%'"
+        )
+        await _copy(
+            conn,
+            "users",
+            USER_COLUMNS,
+            lambda offset, count: _user_rows(first + offset, count, password, now, rng),
+            args.users,
+            args.chunk,
+        )
+
+        user_ids = [
+            row["id"]
+            for row in await conn.fetch(
+                "SELECT id FROM users WHERE username LIKE 'fixture\\_%'"
+            )
+        ]
+        if args.sessions and user_ids:
+            await _copy(
+                conn,
+                "user_sessions",
+                SESSION_COLUMNS,
+                lambda offset, count: _session_rows(offset, count, user_ids, now, rng),
+                args.sessions,
+                args.chunk,
+            )
+
+        start = time.perf_counter()
+        await conn.execute("VACUUM ANALYZE users")
+        await conn.execute("VACUUM ANALYZE user_sessions")
+        print(f"vacuum analyze: {time.perf_counter() - start:.1f}s")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--sessions", type=int, default=3_000_000)
+    parser.add_argument("--chunk", type=int, default=50_000, help="rows per COPY")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="fixture-password")
+    parser.add_argument("--truncate", action="store_true", help="empty both tables first")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,52 @@
+"""store datetimes as timestamptz
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:05:00.000000
+
+Locking: one ALTER TABLE per table, holding ACCESS EXCLUSIVE on it until
+the migration commits. The conversion runs with the transaction's TimeZone
+set to UTC and no USING clause, which PostgreSQL 12+ applies as a catalog
+change without rewriting the table or its indexes, so the lock lasts
+milliseconds regardless of size. On older servers each table is rewritten
+once (reads and writes on it block for the rewrite): plan a maintenance
+window for large tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The application writes timezone-aware UTC datetimes; naive columns made
+# asyncpg reject them. Existing values were written as UTC (now() on a UTC
+# server), so they are reinterpreted as such.
+COLUMNS = {
+    "users": ("update_at", "created_at", "last_login"),
+    "user_sessions": ("login_at", "last_activity", "logout_at", "expires_at"),
+}
+
+
+def _alter_types(table: str, columns: Sequence[str], type_: str) -> None:
+    # all columns in one statement: at most one rewrite per table
+    alterations = ", ".join(f"ALTER COLUMN {column} TYPE {type_}" for column in columns)
+    op.execute(f"ALTER TABLE {table} {alterations}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("SET LOCAL TimeZone = 'UTC'")
+    for table, columns in COLUMNS.items():
+        _alter_types(table, columns, "TIMESTAMP WITH TIME ZONE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("SET LOCAL TimeZone = 'UTC'")
+    for table, columns in COLUMNS.items():
+        _alter_types(table, columns, "TIMESTAMP WITHOUT TIME ZONE")
@@ -0,0 +1,64 @@
+"""indexes for hot session and user predicates
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial predicate) - keep in sync with the models'
+# __table_args__.
+INDEXES = (
+    ("ix_user_sessions_user_id", "user_sessions", ["user_id"], None),
+    (
+        "ix_user_sessions_active_user_id_expires_at",
+        "user_sessions",
+        ["user_id", "expires_at"],
+        "is_active",
+    ),
+    ("ix_user_sessions_active_expires_at", "user_sessions", ["expires_at"], "is_active"),
+    ("ix_user_sessions_expires_at", "user_sessions", ["expires_at"], None),
+    ("ix_user_sessions_inactive_logout_at", "user_sessions", ["logout_at"], "NOT is_active"),
+    ("ix_user_sessions_login_at", "user_sessions", ["login_at"], None),
+    ("ix_users_last_login", "users", ["last_login"], None),
+    ("ix_users_created_at_id", "users", ["created_at", "id"], None),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction; building online keeps
+    # logins and session writes going on large tables.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,43 @@
+"""covering index for user ETag validators
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (id) INCLUDE (update_at): conditional GETs read the validator with an
+    # index-only scan instead of fetching the row
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_id_update_at",
+            "users",
+            ["id"],
+            postgresql_include=["update_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_id_update_at",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,44 @@
+"""drop the covering index for user ETag validators
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 11:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (id) INCLUDE (update_at) duplicated the primary key, and since every
+    # UPDATE on users changes update_at it ruled out HOT updates (e.g. the
+    # last_login update on each login). Validators are read by primary key.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_id_update_at",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_id_update_at",
+            "users",
+            ["id"],
+            postgresql_include=["update_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
@@ -1,10 +1,23 @@
 import apiClient from "@/services/apiClient";
 import type { ApiUser, CreateUserDTO, UpdateUserDTO } from "@/types/user";
 
+type UserPage = { users: ApiUser[]; next_cursor: string | null };
+
 export const usersApi = {
+  // GET /users is keyset-paginated: follow next_cursor until the last page
   getAll: async (): Promise<{ users: ApiUser[] }> => {
-    const res = await apiClient.get<{ users: ApiUser[] }>("/users");
-    return res.data;
+    const users: ApiUser[] = [];
+    let cursor: string | null = null;
+    do {
+      const page: UserPage = (
+        await apiClient.get<UserPage>("/users", {
+          params: { limit: 1000, ...(cursor ? { cursor } : {}) },
+        })
+      ).data;
+      users.push(...page.users);
+      cursor = page.next_cursor;
+    } while (cursor);
+    return { users };
   },
 
   getById: async (id: number): Promise<ApiUser> => {